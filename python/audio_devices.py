@@ -0,0 +1,136 @@
+"""
+Audio device registry.
+Playback tools are looked up on PATH once; PulseAudio sinks are listed once and then kept
+current from `pactl subscribe` (sink new/remove events), so the UI sink list and playback
+never shell out just to probe. on_change(sinks) fires only when the sink list changed.
+"""
+import re
+import shutil
+import subprocess
+import threading
+import time
+
+PLAYERS = ("paplay", "mpv", "pw-play", "ffplay", "ffmpeg", "aplay", "pactl")
+_EVENT = re.compile(r"Event '(\w+)' on sink #(\d+)")
+
+
+def parse_sinks(text):
+    """Parse `pactl list sinks` output into [{"index", "name", "description"}]."""
+    sinks = []
+    current = {}
+    for line in text.split("\n"):
+        line = line.strip()
+        if line.startswith("Sink #"):
+            if current.get("name"):
+                sinks.append({"index": current.get("index", ""), "name": current["name"], "description": current.get("description", current["name"])})
+            current = {"index": line.replace("Sink #", "").strip()}
+        elif line.startswith("Name:"):
+            current["name"] = line.split("Name:")[1].strip()
+        elif line.startswith("Description:"):
+            current["description"] = line.split("Description:")[1].strip()
+    if current.get("name"):
+        sinks.append({"index": current.get("index", ""), "name": current["name"], "description": current.get("description", current["name"])})
+    return sinks
+
+
+class AudioDevices:
+    def __init__(self, env=None, on_change=None):
+        """env: callable returning the subprocess environment (PULSE_SERVER etc.)."""
+        self.env = env
+        self.on_change = on_change
+        self.players = {name: shutil.which(name) for name in PLAYERS}
+        self._lock = threading.Lock()
+        self._sinks = None  # None until the first listing
+        self._subscribed = False
+        self._running = False
+
+    def has(self, player):
+        return bool(self.players.get(player))
+
+    @property
+    def subscribed(self):
+        """True while `pactl subscribe` is keeping the sink cache current."""
+        return self._subscribed
+
+    def _env(self):
+        return self.env() if self.env else None
+
+    def sinks(self, refresh=False):
+        """Cached sinks; lists them (once) if not known yet or refresh is set."""
+        with self._lock:
+            cached = self._sinks
+        if cached is None or refresh:
+            return self.refresh()
+        return list(cached)
+
+    def refresh(self):
+        """Re-list sinks with pactl; fires on_change if the list changed."""
+        if not self.has("pactl"):
+            return []
+        try:
+            out = subprocess.run(
+                ["pactl", "list", "sinks"],
+                capture_output=True, text=True, timeout=5, env=self._env()
+            )
+            sinks = parse_sinks(out.stdout)
+        except Exception as e:
+            print(f"pactl list sinks failed: {e}")
+            with self._lock:
+                return list(self._sinks or [])
+        self._set(sinks)
+        return list(sinks)
+
+    def _set(self, sinks):
+        with self._lock:
+            changed = sinks != self._sinks
+            first = self._sinks is None
+            self._sinks = sinks
+        if changed and not first and self.on_change:
+            try:
+                self.on_change(list(sinks))
+            except Exception as e:
+                print(f"Audio sink update failed: {e}")
+
+    def _remove(self, index):
+        with self._lock:
+            sinks = [s for s in self._sinks or [] if s["index"] != index]
+        self._set(sinks)
+
+    def start(self):
+        """Start following `pactl subscribe`; restarts it (with backoff) if it exits."""
+        if self._running or not self.has("pactl"):
+            return self
+        self._running = True
+        threading.Thread(target=self._subscribe, name="pactl-subscribe", daemon=True).start()
+        return self
+
+    def _subscribe(self):
+        backoff = 1.0
+        while self._running:
+            try:
+                proc = subprocess.Popen(
+                    ["pactl", "subscribe"],
+                    stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, env=self._env()
+                )
+            except OSError as e:
+                print(f"pactl subscribe failed: {e}")
+                return
+            self._subscribed = True
+            self.refresh()  # catch up on anything missed while not subscribed
+            started = time.time()
+            for line in proc.stdout:
+                if not self._running:
+                    break
+                m = _EVENT.search(line)
+                if not m:
+                    continue
+                event, index = m.groups()
+                if event == "remove":
+                    self._remove(index)  # no need to shell out to drop a sink
+                elif event == "new":
+                    self.refresh()  # name/description only come from a listing
+            self._subscribed = False
+            proc.kill()
+            proc.wait()
+            backoff = 1.0 if time.time() - started > 30 else min(backoff * 2, 60.0)
+            time.sleep(backoff)
@@ -0,0 +1,177 @@
+"""
+Long-lived speaker playback service.
+One mpv runs in idle mode with a JSON IPC socket for the life of the app. Each clip gets
+a FIFO that is appended to mpv's playlist, and its bytes are written while they are
+still being synthesized, so playback starts without a process spawn or a temp file.
+Clips play in order from an in-memory queue. Without mpv (or if it stops working) clips
+go through a fallback callable(bytes) -> bool; the backend that worked is remembered.
+"""
+import json
+import os
+import queue
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+
+_END = object()
+
+
+class Clip:
+    """Bytes of one clip, written by the producer while the player is already consuming them."""
+
+    def __init__(self):
+        self._chunks = queue.Queue()
+        self.received = []  # everything written so far, for the fallback path
+        self.aborted = False
+
+    def write(self, data):
+        if data and not self.aborted:
+            self.received.append(data)
+            self._chunks.put(data)
+
+    def close(self):
+        self._chunks.put(_END)
+
+    def abort(self):
+        self.aborted = True
+        self._chunks.put(_END)
+
+    def chunks(self):
+        while True:
+            data = self._chunks.get()
+            if data is _END:
+                return
+            yield data
+
+    def data(self):
+        """Block until the producer finishes; all bytes (empty if aborted)."""
+        for _ in self.chunks():
+            pass
+        return b"" if self.aborted else b"".join(self.received)
+
+
+class AudioPlayer:
+    def __init__(self, has_player, env=None, sink=None, fallback=None, open_timeout=120.0):
+        """has_player(name) -> bool (e.g. AudioDevices.has); env: callable -> subprocess env;
+        sink: callable -> PulseAudio sink name or None; fallback(bytes) -> bool."""
+        self.has_player = has_player
+        self.env = env
+        self.sink = sink
+        self.fallback = fallback
+        self.open_timeout = open_timeout
+        self.backend = "mpv" if has_player("mpv") and hasattr(os, "mkfifo") else "fallback"
+        self._queue = queue.Queue()
+        self._dir = tempfile.mkdtemp(prefix="teddy-audio-")
+        self._proc = None
+        self._sock = None
+        self._device = None
+        self._ids = 0
+        self._stats = {"clips": 0, "failed": 0}
+        threading.Thread(target=self._run, name="audio-player", daemon=True).start()
+
+    def stream(self):
+        """Queue a new clip and return it; write() bytes as they arrive, then close()."""
+        clip = Clip()
+        self._queue.put(clip)
+        return clip
+
+    def stats(self):
+        return dict(self._stats, backend=self.backend, queued=self._queue.qsize())
+
+    # --- mpv ---
+    def _ipc(self, *command):
+        self._sock.sendall((json.dumps({"command": list(command)}) + "\n").encode())
+
+    def _drain(self, sock):
+        """mpv pushes events to every IPC client; read and drop them so it never blocks."""
+        try:
+            while sock.recv(4096):
+                pass
+        except OSError:
+            pass
+
+    def _start_mpv(self):
+        if self._proc and self._proc.poll() is None and self._sock:
+            return
+        path = os.path.join(self._dir, "mpv.sock")
+        if os.path.exists(path):
+            os.remove(path)
+        self._proc = subprocess.Popen(
+            ["mpv", "--idle=yes", "--no-video", "--really-quiet", "--no-terminal",
+             "--cache=no", "--audio-buffer=0.1", f"--input-ipc-server={path}"],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            env=self.env() if self.env else None,
+        )
+        deadline = time.time() + 5.0
+        while not os.path.exists(path):
+            if self._proc.poll() is not None or time.time() > deadline:
+                raise RuntimeError("mpv did not open its IPC socket")
+            time.sleep(0.02)
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.connect(path)
+        threading.Thread(target=self._drain, args=(self._sock,), name="mpv-ipc", daemon=True).start()
+        self._device = None
+
+    def _open_fifo(self, path):
+        """Open the FIFO for writing once mpv starts reading it (after earlier clips finish)."""
+        deadline = time.time() + self.open_timeout
+        while True:
+            try:
+                return os.open(path, os.O_WRONLY | os.O_NONBLOCK)
+            except OSError:
+                if self._proc.poll() is not None or time.time() > deadline:
+                    raise RuntimeError("mpv never opened the clip")
+                time.sleep(0.005)
+
+    def _play_mpv(self, clip):
+        if clip.aborted:
+            return
+        self._start_mpv()
+        sink = self.sink() if self.sink else None
+        device = f"pulse/{sink}" if sink else "auto"
+        if device != self._device:
+            self._ipc("set_property", "audio-device", device)
+            self._device = device
+        self._ids += 1
+        fifo = os.path.join(self._dir, f"clip{self._ids}.mp3")
+        os.mkfifo(fifo)
+        try:
+            self._ipc("loadfile", fifo, "append-play")
+            fd = self._open_fifo(fifo)
+        finally:
+            os.remove(fifo)  # both ends (or neither) are open now; the name is no longer needed
+        os.set_blocking(fd, True)
+        try:
+            for data in clip.chunks():
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+
+    def _stop_mpv(self):
+        for closer in (lambda: self._sock.close(), lambda: self._proc.kill()):
+            try:
+                closer()
+            except Exception:
+                pass
+        self._sock = None
+
+    # --- worker ---
+    def _run(self):
+        while True:
+            clip = self._queue.get()
+            self._stats["clips"] += 1
+            if self.backend == "mpv":
+                try:
+                    self._play_mpv(clip)
+                    continue
+                except Exception as e:
+                    print(f"mpv playback failed ({e}), using fallback players")
+                    self._stop_mpv()
+                    self.backend = "fallback"
+            data = clip.data()
+            if data and not (self.fallback and self.fallback(data)):
+                self._stats["failed"] += 1
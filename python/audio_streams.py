@@ -0,0 +1,97 @@
+"""
+In-flight speech clips for the HTTP audio endpoint (/audio/<id> on port 7001).
+speak_text writes MP3 bytes into an AudioStream as ElevenLabs produces them; the browser
+fetches the raw bytes over HTTP while they are still arriving, instead of receiving
+base64 inside socket.io JSON. The last few finished clips stay fetchable for late requests;
+once a clip is in the TTS cache its bytes are dropped here and it is served from the cache.
+"""
+import threading
+from collections import OrderedDict
+
+
+class AudioStream:
+    def __init__(self, stream_id, cache_key=None):
+        """cache_key: TTS cache key the finished clip will be stored under (see AudioStreams.cached)."""
+        self.id = str(stream_id)
+        self.cache_key = cache_key
+        self._parts = []  # None once the bytes were dropped in favour of the TTS cache
+        self._size = 0
+        self._cond = threading.Condition()
+        self.done = False
+        self.aborted = False
+
+    @property
+    def size(self):
+        return self._size
+
+    def write(self, data):
+        if not data:
+            return
+        with self._cond:
+            self._parts.append(data)
+            self._size += len(data)
+            self._cond.notify_all()
+
+    def finish(self, aborted=False):
+        with self._cond:
+            self.done = True
+            self.aborted = aborted
+            self._cond.notify_all()
+
+    def drop(self):
+        """The finished clip is in the TTS cache: free its bytes here. Readers already part-way
+        through keep their own reference to them until they are done."""
+        with self._cond:
+            if self.done:
+                self._parts = None
+
+    def reader(self, timeout=30.0):
+        """Generator over the clip (see _read), or None if its bytes were dropped (serve it
+        from the TTS cache under cache_key instead)."""
+        with self._cond:
+            parts = self._parts
+        return None if parts is None else self._read(parts, timeout)
+
+    def _read(self, parts, timeout):
+        """Yield the clip from the start, then new bytes as they are written, until finished.
+        Stops early if nothing arrives for `timeout` seconds."""
+        index = 0
+        while True:
+            with self._cond:
+                if index >= len(parts) and not self.done:
+                    self._cond.wait(timeout)
+                new = parts[index:]
+                index += len(new)
+            if not new:
+                return  # finished, or timed out waiting for more
+            yield b"".join(new)
+
+
+class AudioStreams:
+    def __init__(self, keep=16):
+        """keep: how many clips (newest first) stay fetchable."""
+        self.keep = keep
+        self._streams = OrderedDict()
+        self._lock = threading.Lock()
+
+    def open(self, stream_id, cache_key=None):
+        stream = AudioStream(stream_id, cache_key)
+        with self._lock:
+            self._streams[stream.id] = stream
+            while len(self._streams) > self.keep:
+                oldest = next(iter(self._streams.values()))
+                if not oldest.done:
+                    break  # never drop a clip that is still being written
+                self._streams.popitem(last=False)
+        return stream
+
+    def get(self, stream_id):
+        with self._lock:
+            return self._streams.get(str(stream_id))
+
+    def cached(self, cache_key):
+        """The clip for cache_key is now in the TTS cache: drop the bytes of its finished streams."""
+        with self._lock:
+            streams = [s for s in self._streams.values() if s.cache_key == cache_key and s.done]
+        for stream in streams:
+            stream.drop()
@@ -0,0 +1,203 @@
+"""
+Bluetooth manager around one long-lived interactive bluetoothctl session.
+A reader thread parses its output: devices seen while scanning are pushed as
+bt_device_found events, and pair/connect run in the background and report their
+result through the same event callback, so no UI handler ever waits on Bluetooth.
+Set TEDDY_BLUETOOTHCTL to use another binary (e.g. scripts/fakes/bluetoothctl for testing).
+"""
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+from collections import deque
+
+from metrics import metrics
+
+_ANSI = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]|\x01|\x02")
+_PROMPT = re.compile(r"^(\[[^\]]*\][#>]\s*)+")
+_DEVICE = re.compile(r"^(?:\[(NEW|CHG|DEL)\]\s+)?Device\s+((?:[0-9A-Fa-f]{2}:){5}[0-9A-Fa-f]{2})\s*(.*)$")
+
+
+class BluetoothManager:
+    def __init__(self, binary=None, on_event=None):
+        """on_event(name, payload): bt_device_found, bt_scan_done, bt_pair_result, bt_connect_result."""
+        self.binary = binary or os.environ.get("TEDDY_BLUETOOTHCTL") or "bluetoothctl"
+        self.on_event = on_event
+        self._proc = None
+        self._lock = threading.Lock()          # guards process start / writes
+        self._op_lock = threading.Lock()       # one pair/connect at a time (result lines carry no MAC)
+        self._cond = threading.Condition()
+        self._lines = deque(maxlen=50)         # recent (line_no, line), for pair/connect results
+        self._line_no = 0
+        self._devices = {}                     # mac -> {"mac", "name"}
+        self._scanning = False
+
+    @property
+    def available(self):
+        return shutil.which(self.binary) is not None
+
+    def _emit(self, name, payload):
+        if self.on_event:
+            try:
+                self.on_event(name, payload)
+            except Exception as e:
+                print(f"Bluetooth event {name} failed: {e}")
+
+    def _ensure(self):
+        """Start (or restart) the bluetoothctl session; caller holds self._lock."""
+        if self._proc and self._proc.poll() is None:
+            return True
+        if not self.available:
+            return False
+        try:
+            self._proc = subprocess.Popen(
+                [self.binary],
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                text=True, bufsize=1,
+            )
+        except OSError as e:
+            print(f"bluetoothctl start failed: {e}")
+            self._proc = None
+            return False
+        threading.Thread(target=self._read, args=(self._proc,), name="bluetoothctl", daemon=True).start()
+        return True
+
+    def _send(self, command):
+        with self._lock:
+            if not self._ensure():
+                return False
+            try:
+                self._proc.stdin.write(command + "\n")
+                self._proc.stdin.flush()
+                return True
+            except (OSError, ValueError) as e:
+                print(f"bluetoothctl write failed: {e}")
+                self._proc = None
+                return False
+
+    def _read(self, proc):
+        for raw in proc.stdout:
+            line = _PROMPT.sub("", _ANSI.sub("", raw)).strip()
+            if not line:
+                continue
+            m = _DEVICE.match(line)
+            if m:
+                self._on_device(m.group(1), m.group(2).upper(), m.group(3).strip())
+            with self._cond:
+                self._line_no += 1
+                self._lines.append((self._line_no, line))
+                self._cond.notify_all()
+
+    def _on_device(self, tag, mac, rest):
+        if tag is None and rest == "not available":  # error reply, not a listing
+            return
+        if tag == "DEL":
+            self._devices.pop(mac, None)
+            return
+        if tag == "CHG":
+            # "[CHG] Device MAC Name: Speaker" / "RSSI: -60" - only names matter here
+            if not rest.startswith("Name:") and not rest.startswith("Alias:"):
+                return
+            rest = rest.split(":", 1)[1].strip()
+        name = rest or mac
+        known = self._devices.get(mac)
+        if known and known["name"] == name:
+            return
+        self._devices[mac] = {"mac": mac, "name": name}
+        self._emit("bt_device_found", {"mac": mac, "name": name})
+
+    def devices(self):
+        """Devices seen so far. Also asks bluetoothctl to re-list known devices; any not seen
+        before arrive as bt_device_found events."""
+        self._send("devices")
+        return list(self._devices.values())
+
+    def scan(self, duration=8.0):
+        """Start discovery for `duration` seconds and return immediately; emits bt_scan_done.
+        A scan requested while one is running joins it (one bt_scan_done when that one ends)."""
+        with self._cond:
+            if self._scanning:
+                return True
+            self._scanning = True
+        if not self._send("scan on"):
+            with self._cond:
+                self._scanning = False
+            return False
+        metrics.inc("bt.scan")
+        timer = threading.Timer(duration, self._scan_done)
+        timer.daemon = True
+        timer.start()
+        return True
+
+    def _scan_done(self):
+        self._send("scan off")
+        with self._cond:
+            self._scanning = False
+        self._emit("bt_scan_done", {"devices": list(self._devices.values())})
+
+    def _wait_for(self, after, ok, fail, timeout):
+        """Wait for an output line (numbered > after) starting with one of ok/fail;
+        returns (True|False|None, line)."""
+        deadline = time.time() + timeout
+        with self._cond:
+            while True:
+                for no, line in self._lines:
+                    if no <= after:
+                        continue
+                    if line.startswith(ok):
+                        return True, line
+                    if line.startswith(fail):
+                        return False, line
+                    after = no
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return None, None
+                self._cond.wait(remaining)
+
+    def _run_op(self, event, commands, ok, fail, timeout, timeout_error):
+        with self._op_lock, metrics.timer(event.replace("_result", "").replace("_", ".")):
+            with self._cond:
+                start = self._line_no
+            for command in commands[:-1]:
+                self._send(command)
+            if not self._send(commands[-1]):
+                self._emit(event, {"ok": False, "error": "bluetoothctl not available"})
+                return
+            result, line = self._wait_for(start, ok, fail, timeout)
+            if result is None:
+                self._emit(event, {"ok": False, "error": timeout_error})
+            elif result or "AlreadyExists" in line:
+                self._emit(event, {"ok": True})
+            else:
+                self._emit(event, {"ok": False, "error": line})
+
+    def pair(self, mac):
+        """Trust + pair in the background; emits bt_pair_result."""
+        mac = mac.strip().upper()  # bluetoothctl prints MACs upper-case ("Device AA:BB:... not available")
+        threading.Thread(target=self._run_op, daemon=True, args=(
+            "bt_pair_result", [f"trust {mac}", f"pair {mac}"],
+            ("Pairing successful",), ("Failed to pair", f"Device {mac} not available"),
+            30, "Pairing timeout",
+        )).start()
+
+    def connect(self, mac):
+        """Connect in the background; emits bt_connect_result."""
+        mac = mac.strip().upper()
+        threading.Thread(target=self._run_op, daemon=True, args=(
+            "bt_connect_result", [f"connect {mac}"],
+            ("Connection successful",), ("Failed to connect", f"Device {mac} not available"),
+            15, "Connection timeout",
+        )).start()
+
+    def close(self):
+        with self._lock:
+            if self._proc and self._proc.poll() is None:
+                try:
+                    self._proc.stdin.write("quit\n")
+                    self._proc.stdin.flush()
+                    self._proc.wait(timeout=2)
+                except Exception:
+                    self._proc.kill()
+            self._proc = None
@@ -0,0 +1,144 @@
+"""
+Staged capture pipeline: acquire -> detect -> poem -> speak.
+Each stage has its own bounded queue and worker thread(s), so handlers return
+immediately and consecutive jobs overlap (job 2 can detect while job 1 speaks).
+Jobs carry an id, can be cancelled, and report per-stage status through a callback.
+"""
+import itertools
+import queue
+import threading
+import time
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class StageError(Exception):
+    """Expected, user-facing failure (e.g. "No face detected"); ends the job without a traceback."""
+
+
+class CaptureJob:
+    def __init__(self, job_id, source, data):
+        self.id = job_id
+        self.source = source
+        self.data = data
+        self.state = {}  # outputs handed from stage to stage
+        self.created = time.time()
+        self._cancelled = threading.Event()
+        self._handoff = None
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def check(self):
+        """Raise JobCancelled if the job was cancelled; call between slow steps."""
+        if self._cancelled.is_set():
+            raise JobCancelled()
+
+    def handoff(self):
+        """Pass the job to the next stage now, while the current stage keeps working
+        (e.g. start speaking the first stanza while the poem is still streaming).
+        The current stage is reported "handed_off" here and "done" once it actually returns."""
+        if self._handoff:
+            self._handoff()
+
+
+class CapturePipeline:
+    def __init__(self, stages, max_pending=2, on_status=None):
+        """stages: [(name, fn(job), workers)]. max_pending bounds every stage queue.
+        on_status(job, stage, state, info) with state in queued/running/handed_off/done/failed/cancelled.
+        After a handoff the next stage can report running before this one reports done (or failed)."""
+        self.stages = stages
+        self.on_status = on_status
+        self._queues = [queue.Queue(maxsize=max_pending) for _ in stages]
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        for index, (name, _, workers) in enumerate(stages):
+            for n in range(workers):
+                threading.Thread(target=self._worker, args=(index,), name=f"capture-{name}-{n}", daemon=True).start()
+
+    def submit(self, source, data=None):
+        """Queue a new job; returns it, or None if the pipeline is full."""
+        job = CaptureJob(next(self._ids), source, data or {})
+        try:
+            self._queues[0].put_nowait(job)
+        except queue.Full:
+            return None
+        with self._lock:
+            self._jobs[job.id] = job
+        self._report(job, self.stages[0][0], "queued")
+        return job
+
+    def cancel(self, job_id=None):
+        """Cancel one job (or every active job if job_id is None). Returns the cancelled ids."""
+        with self._lock:
+            jobs = list(self._jobs.values()) if job_id is None else [self._jobs[job_id]] if job_id in self._jobs else []
+        for job in jobs:
+            job.cancel()
+        return [job.id for job in jobs]
+
+    def _report(self, job, stage, state, **info):
+        if self.on_status:
+            try:
+                self.on_status(job, stage, state, info)
+            except Exception as e:
+                print(f"Capture status callback failed: {e}")
+
+    def _finish(self, job):
+        with self._lock:
+            self._jobs.pop(job.id, None)
+
+    def _worker(self, index):
+        name, fn, _ = self.stages[index]
+        last = index == len(self.stages) - 1
+        while True:
+            job = self._queues[index].get()
+            forwarded = []
+            finished = []
+            started = time.time()
+
+            def _forward():
+                if not forwarded and not last:
+                    forwarded.append(True)
+                    if not finished:
+                        self._report(job, name, "handed_off", elapsed_ms=round((time.time() - started) * 1000.0, 1))
+                    self._report(job, self.stages[index + 1][0], "queued")
+                    self._queues[index + 1].put(job)  # blocks while the next stage is backed up
+
+            job._handoff = _forward
+            try:
+                job.check()
+                self._report(job, name, "running")
+                fn(job)
+                job.check()
+            except JobCancelled:
+                self._report(job, name, "cancelled")
+                if not forwarded:
+                    self._finish(job)
+                continue
+            except StageError as e:
+                self._report(job, name, "failed", error=str(e))
+                if not forwarded:
+                    self._finish(job)
+                continue
+            except Exception as e:
+                print(f"Capture stage {name} error: {e}")
+                self._report(job, name, "failed", error=str(e))
+                if not forwarded:
+                    self._finish(job)
+                continue
+            finally:
+                if job._handoff is _forward:
+                    job._handoff = None
+            finished.append(True)
+            self._report(job, name, "done", elapsed_ms=round((time.time() - started) * 1000.0, 1))
+            if last:
+                self._finish(job)
+            else:
+                _forward()
@@ -1,78 +1,217 @@
 """
 FER+ ONNX emotion recognizer (lightweight, no libGL).
 Uses opencv-python-headless + onnxruntime only.
-Model: emotion-ferplus-12-int8.onnx (~19 MB) from ONNX Model Zoo.
+Models from ONNX Model Zoo: emotion-ferplus-8.onnx (fp32, ~34 MB, default)
+or emotion-ferplus-12-int8.onnx (~19 MB, TEDDY_FER_PRECISION=int8).
 """
 import os
+import threading
 import numpy as np
 
+from metrics import metrics
+
 _BUNDLED_MODELS = os.path.join(os.path.dirname(__file__), "models")
+_MODEL_ZOO = "https://github.com/onnx/models/raw/main/validated/vision/body_analysis/emotion_ferplus/model/"
 # Use fp32 model for better accuracy (int8 often biased to neutral)
-_MODEL_NAME = "emotion-ferplus-8"
-_LABELS = ["neutral", "happiness", "surprise", "sadness", "anger", "disgust", "fear", "contempt"]
+_MODELS = {
+    "fp32": "emotion-ferplus-8",
+    "int8": "emotion-ferplus-12-int8",
+}
+_MODEL_NAME = _MODELS["fp32"]
+# FER+ output order; vision.py maps these to the app's emotion names
+LABELS = ["neutral", "happiness", "surprise", "sadness", "anger", "disgust", "fear", "contempt"]
 
 
-def _get_model_path():
+def _get_model_path(precision="fp32"):
     """Use bundled model if present, else download to ~/.emotion_ferplus."""
-    bundled = os.path.join(_BUNDLED_MODELS, _MODEL_NAME + ".onnx")
+    name = _MODELS.get(precision, _MODEL_NAME)
+    bundled = os.path.join(_BUNDLED_MODELS, name + ".onnx")
     if os.path.isfile(bundled):
         return bundled
     cache_dir = os.path.join(os.path.expanduser("~"), ".emotion_ferplus")
     os.makedirs(cache_dir, exist_ok=True)
-    fpath = os.path.join(cache_dir, _MODEL_NAME + ".onnx")
+    fpath = os.path.join(cache_dir, name + ".onnx")
     if not os.path.isfile(fpath):
         import urllib.request
-        url = "https://github.com/onnx/models/raw/main/validated/vision/body_analysis/emotion_ferplus/model/emotion-ferplus-8.onnx"
+        url = _MODEL_ZOO + name + ".onnx"
         print("Downloading FER+ model from", url)
         urllib.request.urlretrieve(url, fpath)
     return fpath
 
 
-def load_emotion_recognizer(model_name=None):
+def _env_int(name, default):
+    try:
+        return int(os.environ.get(name) or default)
+    except ValueError:
+        return default
+
+
+def session_options(intra_op_threads=None, inter_op_threads=None, execution_mode=None, graph_optimization=None):
     """
-    Load FER+ ONNX recognizer. model_name is ignored (kept for API compat).
-    Returns an object with predict_emotions(face_rgb, logits=False) -> (emotion, scores).
+    onnxruntime SessionOptions tuned for a small ARM board. Unset arguments come from env:
+      TEDDY_ORT_INTRA_THREADS  threads inside one op (default: half the cores, so the MJPEG encoder keeps the rest)
+      TEDDY_ORT_INTER_THREADS  threads across independent ops (default 1; only used in parallel mode)
+      TEDDY_ORT_EXECUTION_MODE sequential (default) | parallel
+      TEDDY_ORT_GRAPH_OPT      disable | basic | extended | all (default)
     """
     import onnxruntime as ort
 
-    path = _get_model_path()
     opts = ort.SessionOptions()
     opts.log_severity_level = 3  # Error only - suppress GPU discovery warning
+    if intra_op_threads is None:
+        intra_op_threads = _env_int("TEDDY_ORT_INTRA_THREADS", max(1, (os.cpu_count() or 2) // 2))
+    if inter_op_threads is None:
+        inter_op_threads = _env_int("TEDDY_ORT_INTER_THREADS", 1)
+    opts.intra_op_num_threads = int(intra_op_threads)
+    opts.inter_op_num_threads = int(inter_op_threads)
+    mode = (execution_mode or os.environ.get("TEDDY_ORT_EXECUTION_MODE") or "sequential").lower()
+    opts.execution_mode = (
+        ort.ExecutionMode.ORT_PARALLEL if mode == "parallel" else ort.ExecutionMode.ORT_SEQUENTIAL
+    )
+    level = (graph_optimization or os.environ.get("TEDDY_ORT_GRAPH_OPT") or "all").lower()
+    opts.graph_optimization_level = {
+        "disable": ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+        "basic": ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+        "extended": ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    }.get(level, ort.GraphOptimizationLevel.ORT_ENABLE_ALL)
+    return opts
+
+
+_NEUTRAL = LABELS.index("neutral")
+_STRONG = np.array([i for i, lab in enumerate(LABELS) if lab in ("happiness", "anger", "surprise", "sadness", "fear")])
+
+
+def pick_emotions(scores):
+    """Top FER+ label per row of an (N, 8) score array. If top is neutral (< 0.90) but a strong
+    expression scores > 0.15, prefer the strongest such expression (int8/fp32 both lean neutral)."""
+    scores = np.asarray(scores).reshape(-1, len(LABELS))
+    idx = scores.argmax(axis=1)
+    top = scores[np.arange(len(scores)), idx]
+    strong = np.where(scores[:, _STRONG] > 0.15, scores[:, _STRONG], -np.inf)
+    best = strong.argmax(axis=1)
+    override = (idx == _NEUTRAL) & (top < 0.90) & np.isfinite(strong.max(axis=1))
+    return [LABELS[i] for i in np.where(override, _STRONG[best], idx)]
+
+
+def pick_emotion(scores):
+    """Top FER+ label for one score vector (see pick_emotions)."""
+    return pick_emotions(scores)[0]
+
+
+def load_emotion_recognizer(model_name=None, precision=None, optimized_model_path=None, **session_kwargs):
+    """
+    Load FER+ ONNX recognizer. model_name is ignored (kept for API compat).
+    precision: "fp32" or "int8" (default TEDDY_FER_PRECISION, else fp32).
+    optimized_model_path: cache of the graph-optimized model (default TEDDY_ORT_OPTIMIZED_CACHE;
+      "auto" puts it next to the model, anything else is a directory). The file is named after the
+      source model, so fp32 and int8 never share it. Written on first load, reused afterwards.
+    session_kwargs: passed to session_options() (threads, execution mode, graph optimization).
+    Returns an object with predict_emotions(face, logits=False, color="rgb") -> (emotion, scores)
+    and predict_emotions_batch(faces, logits=False, color="rgb") -> [(emotion, scores), ...].
+    """
+    import onnxruntime as ort
+
+    precision = (precision or os.environ.get("TEDDY_FER_PRECISION") or "fp32").lower()
+    if precision not in _MODELS:
+        print(f"Unknown FER+ precision '{precision}', using fp32")
+        precision = "fp32"
+    path = _get_model_path(precision)
+    opts = session_options(**session_kwargs)
+    cache = optimized_model_path or os.environ.get("TEDDY_ORT_OPTIMIZED_CACHE")
+    if cache:
+        # Keyed by model: a cache built from fp32 must never be loaded when int8 was asked for
+        folder = os.path.dirname(path) if cache == "auto" else os.path.expanduser(cache)
+        os.makedirs(folder or ".", exist_ok=True)
+        cache = os.path.join(folder, os.path.splitext(os.path.basename(path))[0] + ".optimized.onnx")
+    if cache and os.path.isfile(cache) and os.path.getmtime(cache) >= os.path.getmtime(path):
+        # Already optimized offline - don't pay graph optimization again at startup
+        path = cache
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+    elif cache:
+        opts.optimized_model_filepath = cache
     session = ort.InferenceSession(path, opts, providers=["CPUExecutionProvider"])
+    model_input = session.get_inputs()[0]
+    # Model Zoo exports pin the batch dim to 1; a dynamic-batch export gets one run for all faces
+    batch_dim = model_input.shape[0] if model_input.shape else 1
+    max_batch = batch_dim if isinstance(batch_dim, int) and batch_dim > 0 else None
+
+    model_output = session.get_outputs()[0]
 
     class FERPlusRecognizer:
-        def predict_emotions(self, face_rgb, logits=False):
-            """face_rgb: numpy array (H,W,3) RGB. Returns (emotion_str, scores_array)."""
+        model_precision = precision
+        batch_size = max_batch  # faces per session.run; None if the model's batch dim is dynamic
+
+        def __init__(self):
             import cv2
-            gray = cv2.cvtColor(face_rgb, cv2.COLOR_RGB2GRAY)
+            self._cv2 = cv2
+            self._clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(4, 4))
+            self._resized = np.empty((64, 64), dtype=np.uint8)
+            self._bindings = {}  # chunk size -> (input buffer, output buffer, run)
+            self._lock = threading.Lock()  # CLAHE and the buffers are reused across calls
+
+        def _binding(self, n):
+            """Preallocated (n,1,64,64) input / output buffers bound to the session once.
+            Uses IO binding so session runs read and write the numpy buffers in place."""
+            if n in self._bindings:
+                return self._bindings[n]
+            inp = np.empty((n, 1, 64, 64), dtype=np.float32)
+            out_shape = (n,) + tuple(d if isinstance(d, int) else len(LABELS) for d in model_output.shape[1:])
+            out = np.empty(out_shape, dtype=np.float32)
             try:
-                clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(4, 4))
-                gray = clahe.apply(gray)
+                io = session.io_binding()
+                io.bind_ortvalue_input(model_input.name, ort.OrtValue.ortvalue_from_numpy(inp))
+                io.bind_ortvalue_output(model_output.name, ort.OrtValue.ortvalue_from_numpy(out))
+
+                def run():
+                    session.run_with_iobinding(io)
             except Exception:
-                pass
-            resized = cv2.resize(gray, (64, 64), interpolation=cv2.INTER_LINEAR)
+                def run():
+                    out[...] = session.run([model_output.name], {model_input.name: inp})[0].reshape(out_shape)
+            self._bindings[n] = (inp, out, run)
+            return self._bindings[n]
+
+        def _preprocess_into(self, face, color, dst):
+            """Gray + CLAHE + 64x64 resize of one crop, written straight into dst (64x64 float32)."""
+            cv2 = self._cv2
+            if face.ndim == 2:
+                gray = face
+            else:
+                gray = cv2.cvtColor(face, cv2.COLOR_BGR2GRAY if color == "bgr" else cv2.COLOR_RGB2GRAY)
+            gray = self._clahe.apply(gray)
+            cv2.resize(gray, (64, 64), dst=self._resized, interpolation=cv2.INTER_LINEAR)
             # FER+ expects float32 in [0, 255] (per ONNX Model Zoo)
-            inp = resized.astype(np.float32)
-            inp = np.expand_dims(np.expand_dims(inp, 0), 0)
-            out = session.run(None, {"Input3": inp})[0]
-            scores = np.squeeze(out)
+            np.copyto(dst, self._resized, casting="unsafe")
+
+        def _infer(self, faces, color):
+            """Returns (N, 8) raw scores; fixed-batch models are run in chunks of their batch size."""
+            chunk = max_batch or len(faces)
+            scores = np.empty((len(faces), len(LABELS)), dtype=np.float32)
+            with self._lock:
+                for start in range(0, len(faces), chunk):
+                    part = faces[start:start + chunk]
+                    inp, out, run = self._binding(len(part))
+                    with metrics.timer("fer.preprocess"):
+                        for i, face in enumerate(part):
+                            self._preprocess_into(face, color, inp[i, 0])
+                    with metrics.timer("fer.session_run"):
+                        run()
+                    scores[start:start + len(part)] = out.reshape(len(part), -1)
+            return scores
+
+        def predict_emotions(self, face, logits=False, color="rgb"):
+            """face: numpy crop, (H,W,3) in `color` order ("rgb" or "bgr") or (H,W) gray.
+            Returns (emotion_str, scores_array)."""
+            return self.predict_emotions_batch([face], logits=logits, color=color)[0]
+
+        def predict_emotions_batch(self, faces, logits=False, color="rgb"):
+            """faces: list of crops (see predict_emotions), scored in one Nx1x64x64 session run.
+            Returns [(emotion_str, scores_array), ...] in input order."""
+            if not len(faces):
+                return []
+            scores = self._infer(list(faces), color)
             if not logits:
-                exp = np.exp(scores - np.max(scores))
-                scores = exp / exp.sum()
-            idx = int(np.argmax(scores))
-            top_emotion = _LABELS[idx]
-            top_score = float(scores[idx])
-            # If top is neutral but a strong expression has decent confidence, prefer it
-            strong = ["happiness", "anger", "surprise", "sadness", "fear"]
-            if top_emotion == "neutral" and top_score < 0.90:
-                best_strong = None
-                best_score = 0.0
-                for i, lab in enumerate(_LABELS):
-                    s = float(scores[i])
-                    if lab in strong and s > 0.15 and s > best_score:
-                        best_strong, best_score = lab, s
-                if best_strong is not None:
-                    return best_strong, scores
-            return top_emotion, scores
+                exp = np.exp(scores - scores.max(axis=1, keepdims=True))
+                scores = exp / exp.sum(axis=1, keepdims=True)
+            return list(zip(pick_emotions(scores), scores))
 
     return FERPlusRecognizer()
@@ -0,0 +1,65 @@
+"""
+Temporal smoothing of FER+ scores for continuous tracking mode.
+Faces are matched frame to frame by box overlap (IoU); each track keeps an
+exponentially smoothed score vector so blinks and motion blur don't flip the label.
+"""
+import threading
+import time
+
+from emotion_loader import pick_emotion
+
+
+def _iou(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    ix = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+    iy = max(0, min(ay + ah, by + bh) - max(ay, by))
+    inter = ix * iy
+    union = aw * ah + bw * bh - inter
+    return inter / union if union > 0 else 0.0
+
+
+class EmotionTracker:
+    def __init__(self, alpha=0.3, max_age=2.0, min_iou=0.3):
+        """alpha: weight of the newest frame (1.0 = no smoothing).
+        max_age: seconds a track survives without a matching face."""
+        self.alpha = alpha
+        self.max_age = max_age
+        self.min_iou = min_iou
+        self._tracks = []
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def update(self, faces, now=None):
+        """faces: [(box, scores)] with box = (x, y, w, h) and scores a FER+ probability vector.
+        Returns a snapshot of the live tracks after folding in this frame."""
+        now = time.time() if now is None else now
+        with self._lock:
+            unmatched = list(self._tracks)
+            # Largest faces claim their best-overlapping track first
+            for box, scores in sorted(faces, key=lambda f: f[0][2] * f[0][3], reverse=True):
+                best = max(unmatched, key=lambda t: _iou(t["box"], box), default=None)
+                if best is not None and _iou(best["box"], box) >= self.min_iou:
+                    unmatched.remove(best)
+                    best["scores"] = self.alpha * scores + (1.0 - self.alpha) * best["scores"]
+                    best["box"] = tuple(box)
+                    best["last_seen"] = now
+                    best["hits"] += 1
+                else:
+                    self._tracks.append({
+                        "id": self._next_id, "box": tuple(box), "scores": scores.astype(float),
+                        "last_seen": now, "hits": 1,
+                    })
+                    self._next_id += 1
+            self._tracks = [t for t in self._tracks if now - t["last_seen"] <= self.max_age]
+            for t in self._tracks:
+                t["label"] = pick_emotion(t["scores"])
+            return [dict(t) for t in self._tracks]
+
+    def tracks(self, max_age=None, now=None):
+        """Live tracks seen within max_age seconds (default: tracker max_age), largest first."""
+        now = time.time() if now is None else now
+        max_age = self.max_age if max_age is None else max_age
+        with self._lock:
+            live = [dict(t) for t in self._tracks if now - t["last_seen"] <= max_age]
+        return sorted(live, key=lambda t: t["box"][2] * t["box"][3], reverse=True)
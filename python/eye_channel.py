@@ -0,0 +1,101 @@
+"""
+Coalescing eye-state sender for the MCU.
+Callers set the desired eye state (emotion, confidence, gaze x/y, blink) as often as they like;
+one sender thread keeps only the latest state and pushes it over the Bridge when it changed,
+at most max_rate times per second. Blink is a one-shot: it is sent once, then cleared.
+"""
+import threading
+import time
+
+GAZE_X = 2  # pupil offset range in the sketch: x in [-2, 2], y in [-1, 1]
+GAZE_Y = 1
+
+
+class EyeChannel:
+    def __init__(self, send_state, send_legacy=None, max_rate=10.0):
+        """send_state(emotion, confidence, gaze_x, gaze_y, blink): compact setEyeState packet.
+        send_legacy(emotion, confidence): used for emotion changes if send_state fails
+        (firmware without setEyeState)."""
+        self.send_state = send_state
+        self.send_legacy = send_legacy
+        self.min_interval = 1.0 / max(max_rate, 0.1)
+        self._cond = threading.Condition()
+        self._desired = {"emotion": "NEUTRAL", "confidence": 80, "gaze_x": 0, "gaze_y": 0, "blink": False}
+        self._sent = dict(self._desired)  # the sketch boots showing NEUTRAL
+        self._last_send = 0.0
+        self._legacy = False
+        self._running = False
+        self._stats = {"requested": 0, "sent": 0, "errors": 0}
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return self
+            self._running = True
+        threading.Thread(target=self._run, name="eye-channel", daemon=True).start()
+        return self
+
+    def set(self, emotion=None, confidence=None, gaze=None, blink=False):
+        """Update the desired state; gaze is (x, y) in [-1, 1] relative to the frame centre."""
+        with self._cond:
+            d = self._desired
+            if emotion is not None:
+                d["emotion"] = emotion.upper()
+            if confidence is not None:
+                d["confidence"] = int(round(min(max(float(confidence), 0.0), 100.0)))
+            if gaze is not None:
+                d["gaze_x"] = int(round(min(max(gaze[0], -1.0), 1.0) * GAZE_X))
+                d["gaze_y"] = int(round(min(max(gaze[1], -1.0), 1.0) * GAZE_Y))
+            if blink:
+                d["blink"] = True
+            self._stats["requested"] += 1
+            self._cond.notify_all()
+
+    def _pending(self):
+        return self._desired["blink"] or any(
+            self._desired[k] != self._sent[k] for k in ("emotion", "confidence", "gaze_x", "gaze_y")
+        )
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and not self._pending():
+                    self._cond.wait()
+                if not self._running:
+                    return
+                wait = self._last_send + self.min_interval - time.time()
+            if wait > 0:
+                time.sleep(wait)  # updates arriving meanwhile overwrite each other
+            with self._cond:
+                state = dict(self._desired)
+                self._desired["blink"] = False
+            self._last_send = time.time()
+            self._send(state)
+
+    def _send(self, state):
+        prev = self._sent
+        self._sent = state  # a failed send is not retried; the next change resends everything
+        try:
+            if not self._legacy:
+                try:
+                    self.send_state(state["emotion"], state["confidence"], state["gaze_x"], state["gaze_y"], state["blink"])
+                    self._stats["sent"] += 1
+                    return
+                except Exception as e:
+                    if not self.send_legacy:
+                        raise
+                    error = e
+            if prev["emotion"] != state["emotion"] or not self._legacy:
+                self.send_legacy(state["emotion"], float(state["confidence"]))
+            if not self._legacy:
+                # setEyeState failed but setEmotion works: older firmware, stay on the legacy call
+                print(f"setEyeState not available ({error}), falling back to setEmotion")
+                self._legacy = True
+            self._stats["sent"] += 1
+        except Exception:
+            self._stats["errors"] += 1
+
+    def stats(self):
+        with self._cond:
+            coalesced = max(0, self._stats["requested"] - self._stats["sent"] - self._stats["errors"])
+            return dict(self._stats, coalesced=coalesced, legacy=self._legacy, state=dict(self._sent))
@@ -0,0 +1,147 @@
+"""
+Pluggable face detectors (selected with TEDDY_FACE_DETECTOR).
+  haar  - OpenCV Haar cascade (default, no model download)
+  yunet - OpenCV FaceDetectorYN CNN (needs OpenCV >= 4.8, ~230 KB model)
+  onnx  - UltraFace RFB-320 run through onnxruntime (~1.2 MB model)
+Every detector exposes detect(image, min_size=48) -> [(x, y, w, h)] for a BGR or gray image.
+"""
+import os
+import threading
+import numpy as np
+
+from metrics import metrics
+
+_BUNDLED_MODELS = os.path.join(os.path.dirname(__file__), "models")
+_YUNET_MODEL = "face_detection_yunet_2023mar"
+_YUNET_URL = "https://github.com/opencv/opencv_zoo/raw/main/models/face_detection_yunet/face_detection_yunet_2023mar.onnx"
+_ULTRAFACE_MODEL = "version-RFB-320"
+_ULTRAFACE_URL = "https://github.com/onnx/models/raw/main/validated/vision/body_analysis/ultraface/models/version-RFB-320.onnx"
+
+BACKENDS = ("haar", "yunet", "onnx")
+
+
+def _get_model_path(name, url):
+    """Use bundled model if present, else download to ~/.emotion_ferplus (shared with FER+)."""
+    bundled = os.path.join(_BUNDLED_MODELS, name + ".onnx")
+    if os.path.isfile(bundled):
+        return bundled
+    cache_dir = os.path.join(os.path.expanduser("~"), ".emotion_ferplus")
+    os.makedirs(cache_dir, exist_ok=True)
+    fpath = os.path.join(cache_dir, name + ".onnx")
+    if not os.path.isfile(fpath):
+        import urllib.request
+        print("Downloading face detector model from", url)
+        urllib.request.urlretrieve(url, fpath)
+    return fpath
+
+
+def _to_bgr(image):
+    import cv2
+    return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR) if image.ndim == 2 else image
+
+
+class HaarDetector:
+    name = "haar"
+
+    def __init__(self, scale_factor=1.1, min_neighbors=5):
+        import cv2
+        self._cascade = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_frontalface_default.xml")
+        if self._cascade.empty():
+            raise RuntimeError("Haar cascade failed to load")
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+        self._lock = threading.Lock()  # CascadeClassifier is not safe to share across threads
+
+    def detect(self, image, min_size=48):
+        import cv2
+        with metrics.timer("face_detect.cvtcolor"):
+            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+        with self._lock, metrics.timer("face_detect.cascade"):
+            faces = self._cascade.detectMultiScale(
+                gray, self.scale_factor, self.min_neighbors, minSize=(min_size, min_size)
+            )
+        return [tuple(int(v) for v in f) for f in faces]
+
+
+class YuNetDetector:
+    name = "yunet"
+
+    def __init__(self, input_size=320, score_threshold=0.7):
+        """input_size: longest side the image is downscaled to before inference."""
+        import cv2
+        path = _get_model_path(_YUNET_MODEL, _YUNET_URL)
+        self._net = cv2.FaceDetectorYN.create(path, "", (input_size, input_size), score_threshold, 0.3, 50)
+        self.input_size = input_size
+        self._lock = threading.Lock()  # setInputSize mutates the shared net
+
+    def detect(self, image, min_size=48):
+        import cv2
+        image = _to_bgr(image)
+        h, w = image.shape[:2]
+        scale = min(1.0, self.input_size / float(max(h, w)))
+        small = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA) if scale < 1.0 else image
+        with self._lock:
+            self._net.setInputSize((small.shape[1], small.shape[0]))
+            _, faces = self._net.detect(small)
+        if faces is None:
+            return []
+        boxes = [tuple(int(v / scale) for v in f[:4]) for f in faces]
+        return [b for b in boxes if b[2] >= min_size and b[3] >= min_size]
+
+
+class OnnxFaceDetector:
+    """UltraFace RFB-320: 1x3x240x320 RGB input, outputs per-anchor scores and normalized corner boxes."""
+
+    name = "onnx"
+
+    def __init__(self, score_threshold=0.7, nms_threshold=0.3):
+        import onnxruntime as ort
+        from emotion_loader import session_options
+        path = _get_model_path(_ULTRAFACE_MODEL, _ULTRAFACE_URL)
+        self._session = ort.InferenceSession(path, session_options(), providers=["CPUExecutionProvider"])
+        self._input_name = self._session.get_inputs()[0].name
+        self.score_threshold = score_threshold
+        self.nms_threshold = nms_threshold
+
+    def detect(self, image, min_size=48):
+        import cv2
+        image = _to_bgr(image)
+        h, w = image.shape[:2]
+        rgb = cv2.cvtColor(cv2.resize(image, (320, 240), interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2RGB)
+        inp = ((rgb.astype(np.float32) - 127.0) / 128.0).transpose(2, 0, 1)[None]
+        scores, boxes = self._session.run(None, {self._input_name: inp})
+        scores, boxes = scores[0, :, 1], boxes[0]
+        keep = scores > self.score_threshold
+        if not keep.any():
+            return []
+        scores, boxes = scores[keep], boxes[keep] * np.array([w, h, w, h], dtype=np.float32)
+        rects = [[float(x1), float(y1), float(x2 - x1), float(y2 - y1)] for x1, y1, x2, y2 in boxes]
+        idx = cv2.dnn.NMSBoxes(rects, scores.tolist(), self.score_threshold, self.nms_threshold)
+        out = []
+        for i in np.array(idx).flatten():
+            x, y, bw, bh = (int(v) for v in rects[int(i)])
+            x, y = max(0, x), max(0, y)
+            if bw >= min_size and bh >= min_size:
+                out.append((x, y, bw, bh))
+        return out
+
+
+def load_face_detector(backend=None):
+    """
+    Load a face detector by name (haar, yunet, onnx); default from TEDDY_FACE_DETECTOR, else haar.
+    Falls back to Haar if the requested backend can't be loaded.
+    """
+    backend = (backend or os.environ.get("TEDDY_FACE_DETECTOR") or "haar").strip().lower()
+    if backend == "yunet":
+        try:
+            return YuNetDetector()
+        except Exception as e:
+            print(f"YuNet face detector not available ({e}), using Haar")
+    elif backend == "onnx":
+        try:
+            return OnnxFaceDetector()
+        except Exception as e:
+            print(f"ONNX face detector not available ({e}), using Haar")
+    elif backend != "haar":
+        print(f"Unknown face detector '{backend}', using Haar")
+    return HaarDetector()
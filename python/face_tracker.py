@@ -0,0 +1,98 @@
+"""
+Detect-then-track face boxes for continuous modes.
+The full-frame detector runs only every N frames (or as soon as a face is lost);
+in between each known face is re-found with a cheap search in a small, downscaled
+window around its last box.
+"""
+import time
+
+
+class FaceTracker:
+    def __init__(self, detect, redetect_every=5, search_margin=0.5, track_size=64, search=None):
+        """detect: callable(image, min_size) -> [(x, y, w, h)], e.g. a face_detectors backend.
+        search: same signature, used for the ROI searches (default: detect) - e.g. so they can be
+        timed apart from full-frame detections.
+        redetect_every: run the full detector at least every N frames.
+        search_margin: search window grows the last box by this fraction on each side.
+        track_size: faces are downscaled to roughly this many pixels for the ROI search."""
+        self.detect = detect
+        self.search = search or detect
+        self.redetect_every = max(1, int(redetect_every))
+        self.search_margin = search_margin
+        self.track_size = track_size
+        self._boxes = []
+        self._since_detect = 0
+        self._lost = True
+        self.counts = {"frames": 0, "detections": 0, "tracked": 0, "track_misses": 0}
+        self.timings_ms = {"detect": 0.0, "track": 0.0}  # exponential moving averages
+
+    def reset(self):
+        """Forget the known faces; the next frame gets a full detection."""
+        self._boxes = []
+        self._lost = True
+
+    def process(self, image):
+        """image: full frame (BGR or gray). Returns current face boxes [(x, y, w, h)]."""
+        self.counts["frames"] += 1
+        if self._lost or not self._boxes or self._since_detect >= self.redetect_every:
+            return self._full_detect(image)
+        started = time.perf_counter()
+        tracked = []
+        for box in self._boxes:
+            found = self._search(image, box)
+            if found is None:
+                # Tracking confidence dropped - fall back to a full detection right away
+                self.counts["track_misses"] += 1
+                self._time("track", started)
+                return self._full_detect(image)
+            tracked.append(found)
+        self._time("track", started)
+        self.counts["tracked"] += 1
+        self._since_detect += 1
+        self._boxes = tracked
+        return list(tracked)
+
+    def _full_detect(self, image):
+        started = time.perf_counter()
+        self._boxes = [tuple(int(v) for v in b) for b in self.detect(image, min_size=48)]
+        self._time("detect", started)
+        self.counts["detections"] += 1
+        self._since_detect = 0
+        self._lost = not self._boxes
+        return list(self._boxes)
+
+    def _search(self, image, box):
+        import cv2
+        x, y, w, h = box
+        mx, my = int(w * self.search_margin), int(h * self.search_margin)
+        x1, y1 = max(0, x - mx), max(0, y - my)
+        x2, y2 = min(image.shape[1], x + w + mx), min(image.shape[0], y + h + my)
+        roi = image[y1:y2, x1:x2]
+        if roi.size == 0:
+            return None
+        scale = min(1.0, self.track_size / float(max(w, h)))
+        if scale < 1.0:
+            roi = cv2.resize(roi, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        min_size = max(16, int(0.6 * max(w, h) * scale))
+        candidates = self.search(roi, min_size=min_size)
+        if not len(candidates):
+            return None
+        # Candidate whose centre is closest to where the face was
+        cx, cy = (x + w / 2 - x1) * scale, (y + h / 2 - y1) * scale
+        bx, by, bw, bh = min(candidates, key=lambda c: (c[0] + c[2] / 2 - cx) ** 2 + (c[1] + c[3] / 2 - cy) ** 2)
+        return (int(x1 + bx / scale), int(y1 + by / scale), int(bw / scale), int(bh / scale))
+
+    def _time(self, stage, started):
+        ms = (time.perf_counter() - started) * 1000.0
+        prev = self.timings_ms[stage]
+        self.timings_ms[stage] = ms if prev == 0.0 else 0.9 * prev + 0.1 * ms
+
+    def stats(self):
+        frames = self.counts["frames"] or 1
+        return {
+            **self.counts,
+            "detect_ratio": self.counts["detections"] / frames,
+            "detect_ms": round(self.timings_ms["detect"], 2),
+            "track_ms": round(self.timings_ms["track"], 2),
+            "redetect_every": self.redetect_every,
+        }
@@ -0,0 +1,143 @@
+"""
+Single-reader camera frame hub.
+One thread owns the VideoCapture and publishes frames into a small ring buffer;
+stream viewers, captures and analytics read from the hub and never touch the device.
+Frames are shared between consumers - treat them as read-only.
+JpegCache encodes each frame once per stream variant and shares the bytes with all viewers,
+and (static_threshold > 0) keeps serving the previous JPEG while the picture does not change.
+"""
+import threading
+import time
+from collections import deque
+
+from metrics import metrics
+from scene_gate import difference, thumbnail
+
+
+class FrameHub:
+    def __init__(self, open_camera, size=4, on_open=None):
+        """open_camera: callable returning an opened cv2.VideoCapture (or None).
+        on_open: optional callable run each time the camera is (re)opened."""
+        self._open_camera = open_camera
+        self._on_open = on_open
+        self._frames = deque(maxlen=size)
+        self._cond = threading.Condition()
+        self._seq = 0
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return self
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="frame-hub", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        cap = None
+        failures = 0
+        while self._running:
+            if cap is None or not cap.isOpened():
+                cap = self._open_camera()
+                if cap is None:
+                    time.sleep(1.0)
+                    continue
+                if self._on_open:
+                    self._on_open()
+            with metrics.timer("camera_read"):
+                ret, frame = cap.read()
+            if not ret or frame is None:
+                failures += 1
+                if failures >= 20:
+                    # Device went away (unplugged / driver hiccup) - reopen it
+                    print("Camera read failing, reopening")
+                    cap.release()
+                    cap = None
+                    failures = 0
+                time.sleep(0.05)
+                continue
+            failures = 0
+            with self._cond:
+                self._seq += 1
+                self._frames.append((self._seq, time.time(), frame))
+                self._cond.notify_all()
+        if cap is not None:
+            cap.release()
+
+    def latest(self):
+        """Newest (seq, timestamp, frame) or None if nothing captured yet. Never blocks."""
+        with self._cond:
+            return self._frames[-1] if self._frames else None
+
+    def frame_interval(self, default=1.0 / 15):
+        """Average seconds between the buffered frames (default until two frames exist)."""
+        with self._cond:
+            if len(self._frames) < 2:
+                return default
+            return (self._frames[-1][1] - self._frames[0][1]) / (len(self._frames) - 1)
+
+    def wait_next(self, after_seq=0, timeout=2.0):
+        """Block until a frame newer than after_seq exists; return the newest one (or None on timeout).
+        Consumers that fall behind skip straight to the newest frame."""
+        deadline = time.time() + timeout
+        with self._cond:
+            while self._running and (not self._frames or self._frames[-1][0] <= after_seq):
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            return self._frames[-1] if self._frames else None
+
+
+class JpegCache:
+    """Encode-once JPEG cache: each (quality, width) variant of a hub frame is encoded a single
+    time and the same bytes are shared by every stream client asking for that variant.
+    static_threshold: frames whose thumbnail differs from the last encoded one by less than this
+    (mean absolute difference, 0-255) reuse its bytes; refreshed at least every `refresh` seconds."""
+
+    MAX_VARIANTS = 8
+
+    def __init__(self, static_threshold=0.0, refresh=2.0):
+        self.static_threshold = static_threshold
+        self.refresh = refresh
+        self._lock = threading.Lock()
+        self._variants = {}  # (quality, width) -> [lock, seq, jpeg_bytes, last_used, thumbnail, encoded_at]
+
+    def get(self, item, quality=80, width=None):
+        """item: (seq, timestamp, frame) from FrameHub. Returns JPEG bytes (or None if encoding failed)."""
+        seq, _, frame = item
+        key = (quality, width)
+        with self._lock:
+            entry = self._variants.get(key)
+            if entry is None:
+                if len(self._variants) >= self.MAX_VARIANTS:
+                    oldest = min(self._variants, key=lambda k: self._variants[k][3])
+                    del self._variants[oldest]
+                entry = [threading.Lock(), 0, None, 0.0, None, 0.0]
+                self._variants[key] = entry
+            entry[3] = time.time()
+        # Per-variant lock: concurrent clients wait for the one encode instead of repeating it
+        with entry[0]:
+            if entry[1] != seq or entry[2] is None:
+                thumb = None
+                if self.static_threshold > 0:
+                    thumb = thumbnail(frame)
+                    if (entry[2] is not None and time.time() - entry[5] < self.refresh
+                            and difference(thumb, entry[4]) < self.static_threshold):
+                        entry[1] = seq  # static scene: the previous JPEG still shows it
+                        metrics.inc("mjpeg_static_skipped")
+                        return entry[2]
+                entry[2] = _encode_jpeg(frame, quality, width)
+                entry[1], entry[4], entry[5] = seq, thumb, time.time()
+            return entry[2]
+
+
+def _encode_jpeg(frame, quality, width):
+    import cv2
+    if width and width < frame.shape[1]:
+        height = max(1, int(round(frame.shape[0] * width / frame.shape[1])))
+        frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+    ok, buf = cv2.imencode(".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), int(quality)])
+    return buf.tobytes() if ok else None
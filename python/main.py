@@ -11,28 +11,14 @@ import shutil
 import subprocess
 os.environ.setdefault("ORT_DISABLE_GPU", "1")
 
-# Set ONNX log level before any ort use (suppresses GPU discovery warning)
-try:
-    import onnxruntime as _ort
-    _ort.set_default_logger_severity(3)  # Error only
-except ImportError:
-    pass
+from startup import FAILED, Startup, missing_modules
 
 # Bootstrap: install deps if missing (prefer offline bundle)
+_BOOTSTRAP_PACKAGES = {"onnxruntime": "onnxruntime", "google.genai": "google-genai", "elevenlabs": "elevenlabs"}
+
 def _bootstrap_deps():
-    missing = []
-    try:
-        import onnxruntime  # noqa: F401
-    except ImportError:
-        missing.append("onnxruntime")
-    try:
-        from google import genai  # noqa: F401
-    except ImportError:
-        missing.append("google-genai")
-    try:
-        import elevenlabs  # noqa: F401
-    except ImportError:
-        missing.append("elevenlabs")
+    # find_spec only locates the packages; the heavy imports happen later, in the startup loaders
+    missing = [_BOOTSTRAP_PACKAGES[m] for m in missing_modules(_BOOTSTRAP_PACKAGES)]
     if not missing:
         return
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -65,43 +51,108 @@ _script_dir = os.path.dirname(os.path.abspath(__file__))
 _project_root = os.path.dirname(_script_dir)
 load_dotenv(os.path.join(_project_root, ".env"))
 
+# --- Tunables (from .env, see .env.example) ---
+def _env_bool(name: str, default: bool = False) -> bool:
+    val = (os.environ.get(name) or "").strip().lower()
+    return val in ("1", "true", "yes", "on") if val else default
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name) or default)
+    except ValueError:
+        return default
+
+EMOTION_TRACKING = _env_bool("TEDDY_EMOTION_TRACKING")  # continuous background emotion tracking
+TRACKING_FPS = _env_float("TEDDY_TRACKING_FPS", 4.0)  # frames sampled per second
+TRACKING_ALPHA = _env_float("TEDDY_TRACKING_ALPHA", 0.3)  # weight of newest frame in the smoothed scores
+TRACKING_MAX_AGE = _env_float("TEDDY_TRACKING_MAX_AGE", 2.0)  # seconds a face track survives unseen
+TRACKING_REDETECT_EVERY = int(_env_float("TEDDY_REDETECT_EVERY", 5))  # full face detection every N frames
+EYE_MAX_RATE = _env_float("TEDDY_EYE_RATE", 10.0)  # eye-state packets per second sent to the MCU
+AUDIO_OUTPUT = (os.environ.get("TEDDY_AUDIO_OUTPUT") or "browser").strip().lower()  # browser, speaker or both
+SCENE_THRESHOLD = _env_float("TEDDY_SCENE_THRESHOLD", 3.0)  # thumbnail change (0-255) that counts as a new scene; 0 = always analyse
+SCENE_MAX_AGE = _env_float("TEDDY_SCENE_MAX_AGE", 60.0)  # seconds a reused face/emotion result stays valid
+STREAM_STATIC_THRESHOLD = _env_float("TEDDY_STREAM_STATIC_THRESHOLD", 1.0)  # below this the MJPEG stream re-sends the last JPEG
+
 from arduino.app_utils import App, Bridge
 from arduino.app_bricks.web_ui import WebUI
 import base64
 import numpy as np
 import io
+import itertools
 import json
+import queue
+import re
+import tempfile
 import threading
 import time
 from datetime import datetime, UTC
+from frame_hub import FrameHub, JpegCache
+from emotion_tracker import EmotionTracker
+from face_tracker import FaceTracker
+from tts_cache import AudioCache
+from poem_pool import PoemPool
+from capture_pipeline import CapturePipeline, StageError
+from eye_channel import EyeChannel
+from bluetooth_manager import BluetoothManager
+from audio_devices import AudioDevices
+from audio_player import AudioPlayer
+from audio_streams import AudioStreams
+from metrics import metrics
+from vision import EMOTION_MAP, face_result, score_faces
+from scene_gate import SceneGate
 
 # --- Web UI ---
 ui = WebUI()
 
-# --- OpenCV (required for camera, used by emotion too) ---
+# --- Startup: heavy components load in the background, readiness is pushed to the UI ---
+STARTUP_WAIT = 30.0  # seconds a capture waits for a component that is still loading
+startup = Startup(on_change=lambda status: ui.send_message("startup_status", {"components": status}))
+
+# --- OpenCV (required for camera, used by emotion too); imported by the "opencv" loader ---
 cv2 = None
-try:
+
+def _load_opencv():
+    global cv2
     import cv2
-except Exception as e:
-    print(f"OpenCV not available: {e}")
 
 # --- Emotion detection (FER+ ONNX, lightweight, no libGL) ---
 EMOTION_AVAILABLE = False
-face_cascade = None
+EMOTION_COMPONENTS = ("face_detector", "emotion_recognizer")
+face_detector = None
 emotion_recognizer = None
-if cv2:
+
+def _quiet_onnxruntime():
+    # Set ONNX log level before any session is created (suppresses GPU discovery warning)
     try:
-        from emotion_loader import load_emotion_recognizer
-        face_cascade = cv2.CascadeClassifier(
-            cv2.data.haarcascades + "haarcascade_frontalface_default.xml"
-        )
-        emotion_recognizer = load_emotion_recognizer()
-        EMOTION_AVAILABLE = True
-    except Exception as e:
-        err = str(e)
-        print(f"Emotion detection not available: {e}")
-        _req = os.path.join(_script_dir, "requirements.txt")
-        print(f"  -> Install deps: pip install -r {_req}")
+        import onnxruntime
+        onnxruntime.set_default_logger_severity(3)  # Error only
+    except ImportError:
+        pass
+
+def _load_face_detector():
+    global face_detector
+    _quiet_onnxruntime()
+    from face_detectors import load_face_detector
+    face_detector = load_face_detector()  # TEDDY_FACE_DETECTOR=haar|yunet|onnx
+    return face_detector
+
+def _load_emotion_recognizer():
+    global emotion_recognizer
+    _quiet_onnxruntime()
+    from emotion_loader import load_emotion_recognizer
+    emotion_recognizer = load_emotion_recognizer()
+    return emotion_recognizer
+
+def _warm_up_detector(detector):
+    """One dummy detection so the first real capture doesn't pay for lazy initialisation."""
+    detector.detect(np.zeros((240, 320, 3), np.uint8))
+
+def _warm_up_recognizer(recognizer):
+    recognizer.predict_emotions(np.zeros((64, 64, 3), np.uint8), color="bgr")
+
+def _enable_emotion():
+    global EMOTION_AVAILABLE
+    EMOTION_AVAILABLE = True
 
 # --- API keys (from .env or separate files) ---
 def _load_api_key(env_var: str, file_path: str) -> str:
@@ -126,21 +177,23 @@ ELEVENLABS_KEY = _load_api_key("ELEVENLABS_API_KEY", "elevenlabs_api_key.txt")
 
 # --- Gemini ---
 gemini_client = None
-if GEMINI_KEY:
-    try:
-        from google import genai
-        gemini_client = genai.Client(api_key=GEMINI_KEY)
-    except Exception as e:
-        print(f"Gemini init failed: {e}")
+
+def _load_gemini():
+    global gemini_client
+    if not GEMINI_KEY:
+        return False
+    from google import genai
+    gemini_client = genai.Client(api_key=GEMINI_KEY)
 
 # --- ElevenLabs ---
 elevenlabs_client = None
-if ELEVENLABS_KEY:
-    try:
-        from elevenlabs.client import ElevenLabs
-        elevenlabs_client = ElevenLabs(api_key=ELEVENLABS_KEY)
-    except Exception as e:
-        print(f"ElevenLabs init failed: {e}")
+
+def _load_elevenlabs():
+    global elevenlabs_client
+    if not ELEVENLABS_KEY:
+        return False
+    from elevenlabs.client import ElevenLabs
+    elevenlabs_client = ElevenLabs(api_key=ELEVENLABS_KEY)
 
 # --- Bluetooth & Audio ---
 SELECTED_SINK = None  # PulseAudio sink name for playback
@@ -156,107 +209,26 @@ def _get_audio_env():
             break
     return env
 
-def list_audio_sinks():
-    """List PulseAudio sinks (includes Bluetooth when connected)."""
-    if not shutil.which("pactl"):
-        return []
-    try:
-        out = subprocess.run(
-            ["pactl", "list", "sinks"],
-            capture_output=True, text=True, timeout=5, env=_get_audio_env()
-        )
-        sinks = []
-        current = {}
-        for line in out.stdout.split("\n"):
-            line = line.strip()
-            if line.startswith("Sink #"):
-                if current.get("name"):
-                    sinks.append({"index": current.get("index", ""), "name": current["name"], "description": current.get("description", current["name"])})
-                current = {"index": line.replace("Sink #", "").strip()}
-            elif line.startswith("Name:"):
-                current["name"] = line.split("Name:")[1].strip()
-            elif line.startswith("Description:"):
-                current["description"] = line.split("Description:")[1].strip()
-        if current.get("name"):
-            sinks.append({"index": current.get("index", ""), "name": current["name"], "description": current.get("description", current["name"])})
-        return sinks
-    except Exception as e:
-        print(f"list_audio_sinks: {e}")
-        return []
+# Players resolved once; sinks cached and kept current from `pactl subscribe`
+audio_devices = AudioDevices(
+    env=_get_audio_env,
+    on_change=lambda sinks: ui.send_message("audio_sinks", {"sinks": sinks, "error": None}),
+)
 
-def bluetooth_scan():
-    """Scan for Bluetooth devices (run bluetoothctl scan for a few seconds)."""
-    if not shutil.which("bluetoothctl"):
-        return {"devices": [], "error": "Bluetooth only available in SBC mode"}
-    try:
-        proc = subprocess.Popen(
-            ["bluetoothctl", "scan", "on"],
-            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-        )
-        time.sleep(8)
-        proc.terminate()
-        proc.wait(timeout=2)
-    except Exception:
-        pass
-    return {"devices": bluetooth_devices()}
+# One persistent bluetoothctl session; results arrive as bt_* events instead of blocking handlers
+bluetooth = BluetoothManager(on_event=ui.send_message)
+BT_SCAN_SECONDS = 8
 
-def bluetooth_devices():
-    """List known Bluetooth devices."""
-    if not shutil.which("bluetoothctl"):
-        return []
-    try:
-        out = subprocess.run(
-            ["bluetoothctl", "devices"],
-            capture_output=True, text=True, timeout=10
-        )
-        devices = []
-        for line in out.stdout.strip().split("\n"):
-            if "Device" in line:
-                parts = line.split(" ", 2)
-                if len(parts) >= 3:
-                    mac = parts[1]
-                    name = parts[2] if len(parts) > 2 else mac
-                    devices.append({"mac": mac, "name": name})
-        return devices
-    except Exception as e:
-        print(f"bluetooth_devices: {e}")
-        return []
-
-def bluetooth_pair(mac: str) -> dict:
-    """Pair with a Bluetooth device."""
-    try:
-        subprocess.run(
-            ["bluetoothctl", "trust", mac],
-            capture_output=True, timeout=5
-        )
-        r = subprocess.run(
-            ["bluetoothctl", "pair", mac],
-            capture_output=True, text=True, timeout=30
-        )
-        if r.returncode != 0 and "Already exists" not in r.stderr:
-            return {"ok": False, "error": r.stderr or r.stdout}
-        subprocess.run(["bluetoothctl", "trust", mac], capture_output=True, timeout=5)
-        return {"ok": True}
-    except subprocess.TimeoutExpired:
-        return {"ok": False, "error": "Pairing timeout"}
-    except Exception as e:
-        return {"ok": False, "error": str(e)}
-
-def bluetooth_connect(mac: str) -> dict:
-    """Connect to a paired Bluetooth device."""
-    try:
-        r = subprocess.run(
-            ["bluetoothctl", "connect", mac],
-            capture_output=True, text=True, timeout=15
-        )
-        if r.returncode != 0:
-            return {"ok": False, "error": r.stderr or r.stdout}
-        return {"ok": True}
-    except Exception as e:
-        return {"ok": False, "error": str(e)}
+_WORKING_PLAYER = None  # (command without the file, env index) that last played successfully
 
 def _play_audio(filepath: str) -> bool:
     """Play audio file. Tries: paplay -> mpv -> pw-play -> ffplay -> ffmpeg+aplay -> pygame."""
+    with metrics.timer("play_audio"):
+        ok = _play_audio_file(filepath)
+    metrics.inc("play_audio_ok" if ok else "play_audio_failed")
+    return ok
+
+def _play_audio_file(filepath: str) -> bool:
     if not os.path.isfile(filepath):
         print(f"Audio file not found: {filepath}")
         return False
@@ -265,34 +237,38 @@ def _play_audio(filepath: str) -> bool:
     # Try default env first (uses system default sink - e.g. Bluetooth)
     envs = [_get_audio_env(), os.environ.copy()]
     commands = []
-    if SELECTED_SINK and shutil.which("paplay"):
+    if SELECTED_SINK and audio_devices.has("paplay"):
         commands.append(["paplay", "-d", SELECTED_SINK, filepath])
-    if shutil.which("paplay"):
+    if audio_devices.has("paplay"):
         commands.append(["paplay", filepath])
-    if shutil.which("mpv"):
+    if audio_devices.has("mpv"):
         commands.append(["mpv", "--no-video", "--really-quiet", filepath])
-    if shutil.which("pw-play"):
+    if audio_devices.has("pw-play"):
         commands.append(["pw-play", filepath])
-    if shutil.which("ffplay"):
+    if audio_devices.has("ffplay"):
         commands.append(["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet", filepath])
 
-    for cmd in commands:
-        for env in envs:
-            try:
-                subprocess.run(
-                    cmd,
-                    check=True,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL,
-                    timeout=90,
-                    env=env,
-                )
-                return True
-            except (FileNotFoundError, subprocess.CalledProcessError, subprocess.TimeoutExpired):
-                continue
+    global _WORKING_PLAYER
+    attempts = [(cmd, i) for cmd in commands for i in range(len(envs))]
+    # The player/env that worked last time goes first
+    attempts.sort(key=lambda a: (a[0][:-1], a[1]) != _WORKING_PLAYER)
+    for cmd, env_index in attempts:
+        try:
+            subprocess.run(
+                cmd,
+                check=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=90,
+                env=envs[env_index],
+            )
+            _WORKING_PLAYER = (cmd[:-1], env_index)
+            return True
+        except (FileNotFoundError, subprocess.CalledProcessError, subprocess.TimeoutExpired):
+            continue
 
     # aplay only plays WAV - convert MP3 to WAV if ffmpeg available
-    if is_mp3 and shutil.which("ffmpeg") and shutil.which("aplay"):
+    if is_mp3 and audio_devices.has("ffmpeg") and audio_devices.has("aplay"):
         try:
             base, _ = os.path.splitext(filepath)
             wav_path = base + ".wav"
@@ -312,7 +288,7 @@ def _play_audio(filepath: str) -> bool:
         except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError):
             pass
 
-    if not is_mp3 and shutil.which("aplay"):
+    if not is_mp3 and audio_devices.has("aplay"):
         try:
             subprocess.run(["aplay", "-q", filepath], check=True, timeout=90)
             return True
@@ -331,32 +307,183 @@ def _play_audio(filepath: str) -> bool:
         pass
     return False
 
+def _play_bytes(data: bytes) -> bool:
+    """Fallback for the speaker player: write the clip to a temp file and run _play_audio."""
+    fd, path = tempfile.mkstemp(suffix=".mp3", prefix="teddy-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        return _play_audio(path)
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+# Speaker playback: one long-lived mpv fed clip by clip, _play_bytes when mpv isn't usable
+audio_player = None
+if AUDIO_OUTPUT in ("speaker", "both"):
+    audio_player = AudioPlayer(audio_devices.has, env=_get_audio_env, sink=lambda: SELECTED_SINK, fallback=_play_bytes)
+
 # --- TTS (ElevenLabs) ---
 ROMANTIC_VOICE_ID = "KH1SQLVulwP6uG4O3nmT"  # Sarah - warm, expressive
-
-def speak_text(text: str):
-    """Returns (success, error_message). Sends audio to browser for playback (same pipeline as YouTube)."""
+TTS_MODEL_ID = "eleven_multilingual_v2"
+TTS_OUTPUT_FORMAT = "mp3_44100_128"
+TTS_CHUNK_BYTES = 8 * 1024  # ~0.5 s of MP3 per chunk (cached clips fed to the speaker or browser)
+_audio_stream_ids = itertools.count(1)
+audio_streams = AudioStreams()  # in-flight clips served at http://<board>:7001/audio/<id>
+TTS_CACHE_DIR = os.path.expanduser(os.environ.get("TEDDY_TTS_CACHE_DIR") or "~/.teddytalk/tts")
+TTS_CACHE_MB = _env_float("TEDDY_TTS_CACHE_MB", 50)
+
+tts_cache = None
+try:
+    tts_cache = AudioCache(TTS_CACHE_DIR, max_bytes=int(TTS_CACHE_MB * 1024 * 1024))
+except OSError as e:
+    print(f"TTS cache disabled: {e}")
+
+def _tts_cache_key(text: str) -> str:
+    return AudioCache.key(text, ROMANTIC_VOICE_ID, TTS_MODEL_ID, TTS_OUTPUT_FORMAT)
+
+def _tee(chunks, parts: list):
+    for chunk in chunks:
+        parts.append(chunk)
+        yield chunk
+
+def _file_chunks(f, size: int):
+    """Read an open clip lazily, `size` bytes at a time."""
+    return iter(lambda: f.read(size), b"")
+
+def _tts_chunks(text: str):
+    """Yield MP3 bytes from ElevenLabs as they arrive (streaming endpoint when the SDK has it)."""
+    tts = elevenlabs_client.text_to_speech
+    # Streaming endpoint (SDK v2: stream, v1: convert_as_stream); convert as a last resort
+    synth = getattr(tts, "stream", None) or getattr(tts, "convert_as_stream", None) or tts.convert
+    started = time.perf_counter()
+    audio = synth(
+        text=text,
+        voice_id=ROMANTIC_VOICE_ID,
+        model_id=TTS_MODEL_ID,
+        output_format=TTS_OUTPUT_FORMAT,
+    )
+    if isinstance(audio, (bytes, bytearray)):
+        audio = [bytes(audio)]
+    first = True
+    for chunk in audio:
+        if chunk:
+            if first:
+                metrics.observe("tts.first_chunk", (time.perf_counter() - started) * 1000.0)
+                first = False
+            yield chunk
+    metrics.observe("tts.synthesize", (time.perf_counter() - started) * 1000.0)
+
+def _send_audio_stream(chunks, cancelled=None, cache_key=None):
+    """Publish MP3 chunks as an in-flight clip on the 7001 server and tell the browser its URL
+    (audio_stream); the browser fetches raw bytes over HTTP while they are still arriving.
+    Nothing is announced until the first bytes exist, so an empty/invalid reply sends nothing.
+    cancelled: optional callable; when it returns True the stream is aborted.
+    cache_key: TTS cache key the clip will be stored under, so its bytes can be dropped later.
+    Returns total bytes sent."""
+    stream_id = next(_audio_stream_ids)
+    stream = None
+    try:
+        for chunk in chunks:
+            if cancelled and cancelled():
+                break
+            if stream is None:
+                stream = audio_streams.open(stream_id, cache_key)
+                ui.send_message("audio_stream", {"stream_id": stream_id, "url": f"/audio/{stream_id}"})
+            stream.write(chunk)
+        else:
+            if stream is None:
+                return 0
+            ok = stream.size >= 100
+            metrics.inc("audio_bytes_streamed", stream.size)
+            stream.finish(aborted=not ok)
+            ui.send_message("audio_stream_end", {"stream_id": stream_id, "bytes": stream.size, "aborted": not ok})
+            return stream.size if ok else 0
+    except Exception:
+        if stream is not None:
+            stream.finish(aborted=True)
+            ui.send_message("audio_stream_end", {"stream_id": stream_id, "aborted": True})
+        raise
+    # Cancelled
+    if stream is not None:
+        stream.finish(aborted=True)
+        ui.send_message("audio_stream_end", {"stream_id": stream_id, "aborted": True})
+    return 0
+
+def _send_cached_audio(key: str):
+    """Point the browser at a clip already in the TTS cache (served from disk by the 7001 server)."""
+    ui.send_message("audio_stream", {"stream_id": f"c{next(_audio_stream_ids)}", "url": f"/audio/cache/{key}"})
+
+def _drain_audio(chunks, cancelled=None):
+    """Consume chunks without sending them to the browser (speaker-only output); returns bytes seen."""
+    total = 0
+    for chunk in chunks:
+        if cancelled and cancelled():
+            return 0
+        total += len(chunk)
+    return total if total >= 100 else 0
+
+def _to_speaker(chunks, clip):
+    """Pass chunks through while feeding them to a speaker clip; the clip is closed when the
+    stream completes and aborted if it is abandoned (cancel, error)."""
+    done = False
+    try:
+        for chunk in chunks:
+            clip.write(chunk)
+            yield chunk
+        done = True
+    finally:
+        if done:
+            clip.close()
+        else:
+            clip.abort()
+
+def _output_audio(chunks, cancelled=None, cache_key=None, cache_as=None):
+    """Send MP3 chunks to the configured outputs (TEDDY_AUDIO_OUTPUT); returns total bytes.
+    cache_key: the clip is already in the TTS cache, so the browser fetches it from there and
+    the chunks are only read for the speaker.
+    cache_as: the clip will be stored in the TTS cache under this key once complete."""
+    if cache_key and AUDIO_OUTPUT != "speaker":
+        _send_cached_audio(cache_key)
+    if cache_key and not audio_player:
+        return 0
+    if audio_player:
+        chunks = _to_speaker(chunks, audio_player.stream())
+    try:
+        if AUDIO_OUTPUT == "speaker" or cache_key:
+            return _drain_audio(chunks, cancelled)
+        return _send_audio_stream(chunks, cancelled, cache_as)
+    finally:
+        if audio_player:
+            chunks.close()
+
+def speak_text(text: str, cancelled=None):
+    """Returns (success, error_message). Streams audio to the browser as it is synthesized;
+    repeat texts replay from the on-disk TTS cache without calling ElevenLabs.
+    cancelled: optional callable; stops streaming (silently) once it returns True."""
+    key = _tts_cache_key(text)
+    cached = tts_cache.open(key) if tts_cache else None
+    metrics.inc("tts_cache_hit" if cached else "tts_cache_miss")
+    if cached:
+        with cached:
+            _output_audio(_file_chunks(cached, TTS_CHUNK_BYTES), cancelled, cache_key=key)
+        return (True, None)
     if not elevenlabs_client:
         err = "ElevenLabs not configured. Add python/elevenlabs_api_key.txt or set ELEVENLABS_API_KEY in .env"
         print(err)
         return (False, err)
     try:
-        audio = elevenlabs_client.text_to_speech.convert(
-            text=text,
-            voice_id=ROMANTIC_VOICE_ID,
-            model_id="eleven_multilingual_v2",
-            output_format="mp3_44100_128",
-        )
-        audio_bytes = b""
-        if hasattr(audio, "__iter__") and not isinstance(audio, (bytes, str)):
-            for chunk in audio:
-                audio_bytes += chunk
-        else:
-            audio_bytes = audio
-        if len(audio_bytes) < 100:
+        # Play in browser (same pipeline as YouTube) and/or on the board's speaker
+        parts = []
+        sent = _output_audio(_tee(_tts_chunks(text), parts), cancelled, cache_as=key)
+        if cancelled and cancelled():
+            return (False, None)
+        if not sent:
             return (False, "ElevenLabs returned empty/invalid audio (check API credits at elevenlabs.io)")
-        # Play in browser (same pipeline as YouTube - no server playback needed)
-        ui.send_message("audio_play", {"audio_b64": base64.b64encode(audio_bytes).decode()})
+        if tts_cache and tts_cache.put(key, b"".join(parts)):
+            audio_streams.cached(key)  # late fetches of the clip are now served from disk
         return (True, None)
     except Exception as e:
         err_msg = str(e).lower()
@@ -365,7 +492,30 @@ def speak_text(text: str):
             return (False, "ElevenLabs quota/credits exceeded - add credits at elevenlabs.io")
         return (False, f"ElevenLabs error: {str(e)[:80]}")
 
+def synthesize_to_cache(text: str) -> bool:
+    """Synthesize text into the TTS cache without playing it (warms pooled poems)."""
+    if not tts_cache or not elevenlabs_client:
+        return False
+    key = _tts_cache_key(text)
+    if key in tts_cache:
+        return True
+    audio_bytes = b"".join(_tts_chunks(text))
+    if len(audio_bytes) < 100:
+        return False
+    tts_cache.put(key, audio_bytes)
+    return True
+
 # --- Gemini poem ---
+GEMINI_MODEL = "gemini-2.0-flash"
+TTS_EARLY_STANZA = _env_bool("TEDDY_TTS_EARLY_STANZA", True)  # speak the first stanza while the rest streams in
+
+def _poem_prompt(emotion: str) -> str:
+    return f"""Write a poem to read aloud to your significant other. They appear {emotion}.
+Output only the poem - no quotes, no attribution, no extra text. 8-12 lines."""
+
+def _clean_poem(text: str) -> str:
+    return text.strip().strip('"').strip("'") if text else ""
+
 def get_poem_for_emotion(emotion: str):
     """Returns (poem_text, error_message). error_message is None on success."""
     if not gemini_client:
@@ -374,14 +524,13 @@ def get_poem_for_emotion(emotion: str):
             "Gemini API key not configured. Add python/gemini_api_key.txt or set GEMINI_API_KEY in .env",
         )
     try:
-        prompt = f"""Write a poem to read aloud to your significant other. They appear {emotion}.
-Output only the poem - no quotes, no attribution, no extra text. 8-12 lines."""
-        response = gemini_client.models.generate_content(
-            model="gemini-2.0-flash",
-            contents=prompt,
-        )
+        with metrics.timer("gemini.generate"):
+            response = gemini_client.models.generate_content(
+                model=GEMINI_MODEL,
+                contents=_poem_prompt(emotion),
+            )
         text = getattr(response, "text", None) or str(response)
-        poem = text.strip().strip('"').strip("'") if text else ""
+        poem = _clean_poem(text)
         if not poem:
             return (f"I sense you feel {emotion}.", "Gemini returned empty response")
         return (poem, None)
@@ -390,38 +539,99 @@ Output only the poem - no quotes, no attribution, no extra text. 8-12 lines."""
         print(f"Gemini error: {err_msg}")
         return (f"I sense you feel {emotion}. Your feelings matter.", f"Gemini API error: {err_msg}")
 
-# --- Emotion mapping (FER+ labels -> internal) ---
-_EMOTION_MAP = {
-    "anger": "angry", "contempt": "contempt", "disgust": "disgust",
-    "fear": "fear", "happiness": "happy", "neutral": "neutral",
-    "sadness": "sad", "surprise": "surprise",
-}
-
-def _detect_emotion_from_frame(frame):
+def _first_stanza_end(text: str) -> int:
+    """End offset of the first complete stanza (blank line, or 4 complete lines), or -1."""
+    blank = text.find("\n\n")
+    if blank > 0:
+        return blank
+    lines = 0
+    for i, ch in enumerate(text):
+        if ch == "\n":
+            lines += 1
+            if lines == 4:
+                return i
+    return -1
+
+def stream_poem_for_emotion(emotion: str, on_partial=None, on_stanza=None, should_stop=None):
+    """Like get_poem_for_emotion, but streams: on_partial(text) is called with the poem so far
+    each time a line completes, on_stanza(stanza) once when the first stanza is complete.
+    should_stop: optional callable checked per chunk to abandon generation early.
+    Returns (poem_text, error_message). If the stream fails after on_stanza was called, poem_text
+    is the complete lines received so far (starting with that stanza), not the fallback."""
+    if not gemini_client:
+        return get_poem_for_emotion(emotion)
+    raw = ""
+    lines_sent = 0
+    stanza_sent = False
+    started = time.perf_counter()
+    try:
+        for chunk in gemini_client.models.generate_content_stream(
+            model=GEMINI_MODEL,
+            contents=_poem_prompt(emotion),
+        ):
+            if should_stop and should_stop():
+                break
+            raw += getattr(chunk, "text", None) or ""
+            complete = raw.count("\n")
+            if on_partial and complete > lines_sent:
+                lines_sent = complete
+                on_partial(_clean_poem(raw[: raw.rfind("\n")]))
+            if on_stanza and not stanza_sent:
+                end = _first_stanza_end(raw.lstrip())
+                if end > 0:
+                    stanza_sent = True
+                    metrics.observe("gemini.first_stanza", (time.perf_counter() - started) * 1000.0)
+                    on_stanza(_clean_poem(raw.lstrip()[:end]))
+    except Exception as e:
+        err_msg = str(e)
+        print(f"Gemini error: {err_msg}")
+        if stanza_sent:
+            # The first stanza is already being spoken: keep what arrived so text and speech match
+            return (_clean_poem(raw[: raw.rfind("\n")]), f"Gemini API error: {err_msg}")
+        return (f"I sense you feel {emotion}. Your feelings matter.", f"Gemini API error: {err_msg}")
+    metrics.observe("gemini.stream", (time.perf_counter() - started) * 1000.0)
+    poem = _clean_poem(raw)
+    if not poem:
+        return (f"I sense you feel {emotion}.", "Gemini returned empty response")
+    return (poem, None)
+
+# --- Poem pool (K ready poems per emotion, refilled in the background) ---
+POEM_POOL_SIZE = int(_env_float("TEDDY_POEM_POOL_SIZE", 3))
+POEM_POOL_INTERVAL = _env_float("TEDDY_POEM_POOL_INTERVAL", 6.0)  # min seconds between refill calls
+POEM_POOL_PATH = os.path.expanduser(os.environ.get("TEDDY_POEM_POOL_PATH") or "~/.teddytalk/poems.json")
+poem_pool = None
+
+# --- Face analysis (core in vision.py, shared with scripts/benchmark_vision.py) ---
+def _detect_faces(image, min_size=48):
+    with metrics.timer("face_detect"):
+        return face_detector.detect(image, min_size=min_size)
+
+def _search_faces(image, min_size=48):
+    """FaceTracker's ROI searches, timed apart so face_detect stays full-frame detections only."""
+    with metrics.timer("face_track.search"):
+        return face_detector.detect(image, min_size=min_size)
+
+def _score_faces(frame, tracker=None):
+    """Detect every face and score them all in one batched FER+ call.
+    tracker: optional FaceTracker (continuous modes) so the full detector doesn't run every frame.
+    Returns [(box, label, scores)] with raw FER+ probability vectors, largest face first."""
     if not EMOTION_AVAILABLE:
-        return None, {}
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    faces = face_cascade.detectMultiScale(gray, 1.1, 5, minSize=(48, 48))
-    if not len(faces):
-        return None, {}
-    x, y, w, h = max(faces, key=lambda r: r[2] * r[3])
-    # Add padding (~15%) so face isn't cropped too tight - improves FER+ accuracy
-    pad = int(0.15 * max(w, h))
-    x1 = max(0, x - pad)
-    y1 = max(0, y - pad)
-    x2 = min(frame.shape[1], x + w + pad)
-    y2 = min(frame.shape[0], y + h + pad)
-    face_img = frame[y1:y2, x1:x2]
-    face_rgb = cv2.cvtColor(face_img, cv2.COLOR_BGR2RGB)
-    emotion, scores = emotion_recognizer.predict_emotions(face_rgb, logits=False)
-    emotion_lower = _EMOTION_MAP.get(emotion, emotion.lower())
-    emotions = {}
-    if hasattr(scores, "__iter__") and not isinstance(scores, (str, bytes)):
-        labels = ["neutral", "happiness", "surprise", "sadness", "anger", "disgust", "fear", "contempt"]
-        for i, s in enumerate(scores):
-            if i < len(labels):
-                emotions[_EMOTION_MAP.get(labels[i], labels[i])] = float(s) * 100
-    return emotion_lower, emotions
+        return []
+    return score_faces(frame, tracker.process if tracker else _detect_faces, emotion_recognizer)
+
+# Repeated captures of an unchanged scene reuse the last result instead of re-running the models
+scene_gate = SceneGate(SCENE_THRESHOLD, SCENE_MAX_AGE)
+
+def _analyze_faces(frame):
+    """Returns [{"box": [x, y, w, h], "emotion": str, "emotions": {emotion: percent}}], largest face first."""
+    faces = scene_gate.lookup(frame)
+    if faces is not None:
+        metrics.inc("scene_reused")
+        return [dict(face) for face in faces]
+    faces = [face_result(*face) for face in _score_faces(frame)]
+    if EMOTION_AVAILABLE:
+        scene_gate.store(frame, faces, [face["box"] for face in faces])
+    return faces
 
 # --- Camera & MJPEG stream ---
 _camera = None
@@ -448,40 +658,325 @@ def get_camera():
             return cap
         return None
 
-def generate_frames():
-    cap = get_camera()
-    if not cap:
+_frame_hub = None
+_frame_hub_lock = threading.Lock()
+
+def _on_camera_open():
+    """A (re)opened camera may look at a different scene: drop results the scene gates would reuse."""
+    scene_gate.reset()
+    _tracking_gate.reset()
+
+def get_frame_hub():
+    """Shared single-reader hub; the capture thread is the only code that calls cap.read()."""
+    if not cv2:
+        return None
+    global _frame_hub
+    with _frame_hub_lock:
+        if _frame_hub is None:
+            _frame_hub = FrameHub(get_camera, on_open=_on_camera_open).start()
+        return _frame_hub
+
+def grab_frame(timeout=2.0):
+    """Freshest camera frame from the hub. If the newest one is older than two frame intervals
+    (camera stalled or just started) wait up to `timeout` for a new one; None if none arrives."""
+    hub = get_frame_hub()
+    if not hub:
+        return None
+    item = hub.latest()
+    if item is None or time.time() - item[1] > max(2.0 * hub.frame_interval(), 0.1):
+        item = hub.wait_next(item[0] if item else 0, timeout)
+    return item[2] if item else None
+
+# Stream defaults; override per URL, e.g. /stream?fps=10&q=60&w=320
+STREAM_DEFAULT_FPS = 15
+STREAM_DEFAULT_QUALITY = 80
+STREAM_SNDBUF = 32 * 1024  # per-viewer socket send buffer, ~one 640x480 JPEG at q80 after the kernel doubles it
+STREAM_KEEPALIVE = 1.0  # seconds; an unchanged JPEG is only re-sent this often
+_jpeg_cache = JpegCache(static_threshold=STREAM_STATIC_THRESHOLD)
+
+def _mjpeg_part(jpeg: bytes) -> bytes:
+    return (b"--frame\r\nContent-Type: image/jpeg\r\nContent-Length: " + str(len(jpeg)).encode()
+            + b"\r\n\r\n" + jpeg + b"\r\n")
+
+def generate_frames(fps=STREAM_DEFAULT_FPS, quality=STREAM_DEFAULT_QUALITY, width=None):
+    """MJPEG parts at up to fps. Each frame is JPEG-encoded once per (quality, width) and shared
+    across clients; a slow client simply picks up the newest frame when it is ready again."""
+    hub = get_frame_hub()
+    if not hub:
         return
+    interval = 1.0 / fps if fps else 0.0
+    seq = 0
+    next_time = 0.0
+    last_jpeg, last_sent = None, 0.0
     while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-        _, buf = cv2.imencode(".jpg", frame)
-        yield (b"--frame\r\nContent-Type: image/jpeg\r\n\r\n" + buf.tobytes() + b"\r\n")
-
-# --- Rate limiting & poem cache ---
+        if interval:
+            delay = next_time - time.time()
+            if delay > 0:
+                time.sleep(delay)
+        item = hub.wait_next(seq)
+        if item is None:
+            # Camera stalled or reopening: keep the connection (the <img> won't reconnect by itself)
+            # and repeat the last picture now and then so proxies don't drop an idle stream
+            if last_jpeg is not None and time.time() - last_sent >= STREAM_KEEPALIVE:
+                last_sent = time.time()
+                yield _mjpeg_part(last_jpeg)
+            continue
+        seq = item[0]
+        with metrics.timer("mjpeg.frame"):
+            jpeg = _jpeg_cache.get(item, quality, width)
+        if jpeg is None:
+            continue
+        now = time.time()
+        if interval:
+            # Stay on the fps grid; if we fell behind (slow client), restart from now instead of bursting
+            next_time = next_time + interval if now - next_time < interval else now + interval
+        if jpeg is last_jpeg and now - last_sent < STREAM_KEEPALIVE:
+            continue  # static scene: the viewer already shows this picture
+        last_jpeg, last_sent = jpeg, now
+        metrics.inc("mjpeg_frames_sent")
+        yield _mjpeg_part(jpeg)
+
+def _stream_params(query: str) -> dict:
+    """Parse fps / q / w from the /stream query string, clamped to sane ranges."""
+    from urllib.parse import parse_qs
+    params = parse_qs(query)
+
+    def _num(name, default, lo, hi):
+        try:
+            return max(lo, min(hi, int(float(params[name][0]))))
+        except (KeyError, ValueError, IndexError):
+            return default
+
+    return {
+        "fps": _num("fps", STREAM_DEFAULT_FPS, 1, 30),
+        "quality": _num("q", STREAM_DEFAULT_QUALITY, 10, 95),
+        "width": _num("w", None, 80, 1920),
+    }
+
+# --- Robot eyes (latest state coalesced and sent at most EYE_MAX_RATE times per second) ---
+eye_channel = EyeChannel(
+    lambda *state: Bridge.call("setEyeState", *state),
+    send_legacy=lambda emotion, confidence: Bridge.call("setEmotion", emotion, confidence),
+    max_rate=EYE_MAX_RATE,
+).start()
+
+def _face_gaze(box, frame_shape):
+    """Gaze (x, y) in [-1, 1] towards a face box. The camera faces the viewer, so image-left
+    is the viewer's right: x is mirrored for the eyes."""
+    x, y, w, h = box
+    fh, fw = frame_shape[:2]
+    return (1.0 - 2.0 * (x + w / 2.0) / fw, 2.0 * (y + h / 2.0) / fh - 1.0)
+
+# --- Continuous emotion tracking (opt-in, TEDDY_EMOTION_TRACKING=1) ---
+emotion_tracker = EmotionTracker(alpha=TRACKING_ALPHA, max_age=TRACKING_MAX_AGE)
+face_tracker = FaceTracker(_detect_faces, redetect_every=TRACKING_REDETECT_EVERY, search=_search_faces)
+_tracking_gate = SceneGate(SCENE_THRESHOLD, max_age=2.0)  # short max_age: the tracker still re-checks every couple of seconds
+
+def _tracked_faces():
+    """Smoothed per-face results from the tracker, largest first (empty if nobody seen recently)."""
+    return [dict(face_result(t["box"], t["label"], t["scores"]), track_id=t["id"])
+            for t in emotion_tracker.tracks()]
+
+def _tracking_loop():
+    """Sample hub frames at TRACKING_FPS, fold detections into the tracker and push
+    emotion_update only when the dominant (largest face) emotion changes."""
+    interval = 1.0 / max(TRACKING_FPS, 0.1)
+    seq = 0
+    last_emotion = None
+    while True:
+        started = time.time()
+        hub = get_frame_hub()
+        item = hub.wait_next(seq) if hub else None
+        if item is None:
+            face_tracker.reset()  # camera stalled or reopening: faces may have moved meanwhile
+        else:
+            seq = item[0]
+            try:
+                # Unchanged scene: feed the tracker the last detections instead of running the models
+                detections = _tracking_gate.lookup(item[2])
+                if detections is None:
+                    detections = [(box, scores) for box, _, scores in _score_faces(item[2], face_tracker)]
+                    _tracking_gate.store(item[2], detections, [box for box, _ in detections])
+                else:
+                    metrics.inc("tracking_frames_reused")
+                emotion_tracker.update(detections, item[1])
+            except Exception as e:
+                print(f"Tracking error: {e}")
+            faces = _tracked_faces()
+            emotion = faces[0]["emotion"] if faces else None
+            if emotion is not None:
+                # Eyes follow the largest face every frame; the channel drops unchanged states
+                eye_channel.set(emotion, faces[0]["emotions"].get(emotion, 80), gaze=_face_gaze(faces[0]["box"], item[2].shape))
+            if emotion is not None and emotion != last_emotion:
+                emotions = faces[0]["emotions"]
+                ui.send_message("emotion_update", {
+                    "emotion": emotion,
+                    "emotions": emotions,
+                    "faces": faces,
+                    "tracking": True,
+                    "timestamp": datetime.now(UTC).isoformat(),
+                })
+            last_emotion = emotion
+        time.sleep(max(0.0, interval - (time.time() - started)))
+
+# --- Rate limiting ---
 LAST_CAPTURE_TIME = 0.0
 CAPTURE_COOLDOWN = 10  # seconds between captures
-LAST_EMOTION = None
-LAST_POEM = None
-LAST_POEM_TIME = 0.0
-POEM_CACHE_TIME = 30  # seconds to reuse poem for same emotion
-CAPTURE_IN_PROGRESS = False
+CAPTURE_MAX_PENDING = 2  # jobs waiting per pipeline stage before new captures are refused
+_capture_lock = threading.Lock()
+
+# --- Capture pipeline stages (acquire -> detect -> poem -> speak) ---
+def _stage_acquire(job):
+    """Camera frame, uploaded image, or (tracking mode) the already-smoothed faces."""
+    image_b64 = job.data.get("image")
+    if not cv2:
+        startup.wait(("opencv",), timeout=STARTUP_WAIT)  # right after boot OpenCV may still be importing
+    if not cv2:
+        raise StageError("OpenCV not available (install libgl1)")
+    # Tracking mode: reuse the smoothed result the background loop already computed
+    faces = _tracked_faces() if EMOTION_TRACKING and not image_b64 else []
+    if faces:
+        job.state["faces"] = faces
+        return
+    if image_b64:
+        with metrics.timer("image_decode"):
+            img_bytes = base64.b64decode(image_b64)
+            img_arr = cv2.imdecode(
+                np.frombuffer(img_bytes, np.uint8),
+                cv2.IMREAD_COLOR
+            )
+    else:
+        # Latest frame from the shared camera hub (no extra device read)
+        if not get_frame_hub():
+            raise StageError("No camera found")
+        img_arr = grab_frame()
+        if img_arr is None:
+            raise StageError("No camera frame (camera stalled?)")
+    if img_arr is None:
+        raise StageError("Invalid image")
+    job.state["image"] = img_arr
+
+def _stage_detect(job):
+    if not EMOTION_AVAILABLE:
+        startup.wait(("emotion",), timeout=STARTUP_WAIT)  # models may still be warming up
+    if not EMOTION_AVAILABLE:
+        raise StageError("Emotion detection not available")
+    faces = job.state.get("faces") or _analyze_faces(job.state.pop("image"))
+    if not faces:
+        raise StageError("No face detected")
+    # Largest face drives the eyes and the poem; every face is reported to the UI
+    emotion, emotions = faces[0]["emotion"], faces[0]["emotions"]
+    job.state.update(faces=faces, emotion=emotion)
+    ui.send_message("emotion_update", {
+        "emotion": emotion,
+        "emotions": emotions,
+        "faces": faces,
+        "job_id": job.id,
+        "timestamp": datetime.now(UTC).isoformat(),
+    })
+    # Update OLED/LCD eyes (queued; the eye channel thread does the Bridge call)
+    eye_channel.set(emotion, emotions.get(emotion, 80))
+    job.handoff()
+
+def _stage_poem(job):
+    """Pooled poem (instant, pre-synthesized) or a streamed Gemini poem. Texts to speak go to
+    job.state["speech"]; the speak stage starts as soon as the first one is queued."""
+    emotion = job.state["emotion"]
+    speech = job.state["speech"] = queue.Queue()
+    api_error = None
+    stanza = []  # first stanza, once it has been queued for speaking
+    startup.wait(("gemini",), timeout=STARTUP_WAIT)
+    try:
+        # Ready poem from the pool (or, while it refills, the last one served for this emotion);
+        # only call Gemini inline when there is neither
+        poem = poem_pool.take(emotion, reuse_last=True) if poem_pool else None
+        if poem is not None:
+            speech.put(poem)
+            job.handoff()
+        else:
+            def _on_partial(text):
+                ui.send_message("poem_partial", {"emotion": emotion, "poem": text, "job_id": job.id})
+
+            def _on_stanza(text):
+                # Speak the first stanza while the rest is still being generated
+                stanza.append(text)
+                speech.put(text)
+                job.handoff()
+
+            poem, api_error = stream_poem_for_emotion(
+                emotion, _on_partial, _on_stanza if (TTS_EARLY_STANZA and elevenlabs_client) else None,
+                should_stop=lambda: job.cancelled,
+            )
+            job.check()
+            if not stanza:
+                speech.put(poem)
+            elif poem.startswith(stanza[0]) and poem[len(stanza[0]):].strip():
+                speech.put(poem[len(stanza[0]):].strip())
+    finally:
+        speech.put(None)  # the speak stage may already be waiting on this queue
+    # partial: the stream broke after the first stanza; the poem is what was received (and spoken)
+    partial = bool(stanza) and bool(api_error)
+    ui.send_message("poem", {"emotion": emotion, "poem": poem, "api_error": api_error, "partial": partial,
+                             "job_id": job.id})
+    ui.send_message("capture_result", {
+        "ok": True,
+        "job_id": job.id,
+        "emotion": emotion,
+        "face_count": len(job.state["faces"]),
+        "cooldown_remaining": max(0.0, CAPTURE_COOLDOWN - (time.time() - job.created)),
+        "api_error": api_error,
+    })
+
+def _stage_speak(job):
+    speech = job.state["speech"]
+    while True:
+        text = speech.get()
+        if text is None:
+            return
+        job.check()
+        startup.wait(("elevenlabs",), timeout=STARTUP_WAIT)
+        tts_ok, tts_err = speak_text(text, cancelled=lambda: job.cancelled)
+        if tts_err:
+            ui.send_message("tts_error", {"error": tts_err, "job_id": job.id})
+            return
+
+def _on_capture_status(job, stage, state, info):
+    ui.send_message("capture_status", {"job_id": job.id, "source": job.source, "stage": stage, "state": state, **info})
+    if state == "handed_off":
+        metrics.observe(f"capture.{stage}.handoff", info.get("elapsed_ms", 0.0))
+    elif state == "done":
+        metrics.observe(f"capture.{stage}", info.get("elapsed_ms", 0.0))
+        if stage == "speak":
+            metrics.observe("capture.total", (time.time() - job.created) * 1000.0)
+    elif state in ("failed", "cancelled"):
+        metrics.inc(f"capture_{state}")
+    if state == "failed":
+        ui.send_message("capture_result", {"error": info.get("error") or "Capture failed", "job_id": job.id})
+    elif state == "cancelled":
+        ui.send_message("capture_result", {"cancelled": True, "job_id": job.id})
+
+capture_pipeline = CapturePipeline(
+    [
+        ("acquire", _stage_acquire, 1),
+        ("detect", _stage_detect, 1),
+        ("poem", _stage_poem, 1),
+        ("speak", _stage_speak, 1),  # one speaker keeps clips of consecutive jobs in order
+    ],
+    max_pending=CAPTURE_MAX_PENDING,
+    on_status=_on_capture_status,
+)
 
 # --- Message handlers ---
 def on_capture(client_id, data=None):
-    """Handle capture: grab from USB camera (or use provided image), analyze emotion, poem, speak."""
-    global SELECTED_SINK, LAST_CAPTURE_TIME, LAST_EMOTION, LAST_POEM, LAST_POEM_TIME, CAPTURE_IN_PROGRESS
+    """Handle capture (browser or pin-2 button): queue a pipeline job and return immediately."""
+    global SELECTED_SINK, LAST_CAPTURE_TIME
     data = data or {}
-    if not cv2:
+    if startup.state("opencv") == FAILED:
         ui.send_message("capture_result", {"error": "OpenCV not available (install libgl1)"})
         return
-    try:
+    with _capture_lock:
         # Rate limit: only allow capture after cooldown
         current_time = time.time()
-        if CAPTURE_IN_PROGRESS:
-            ui.send_message("capture_result", {"error": "Processing... please wait"})
-            return
         if current_time - LAST_CAPTURE_TIME < CAPTURE_COOLDOWN and LAST_CAPTURE_TIME > 0:
             remaining = CAPTURE_COOLDOWN - (current_time - LAST_CAPTURE_TIME)
             ui.send_message("capture_result", {
@@ -490,102 +985,58 @@ def on_capture(client_id, data=None):
             })
             return
 
-        CAPTURE_IN_PROGRESS = True
-        LAST_CAPTURE_TIME = current_time
-
         # Select audio sink if provided
         sink = data.get("audio_sink")
         if sink:
             SELECTED_SINK = sink
 
-        image_b64 = data.get("image")
-        if image_b64:
-            img_bytes = base64.b64decode(image_b64)
-            img_arr = cv2.imdecode(
-                np.frombuffer(img_bytes, np.uint8),
-                cv2.IMREAD_COLOR
-            )
-        else:
-            # Grab from USB camera
-            cap = get_camera()
-            if not cap:
-                ui.send_message("capture_result", {"error": "No camera found"})
-                return
-            ret, img_arr = cap.read()
-            if not ret or img_arr is None:
-                ui.send_message("capture_result", {"error": "Could not read from camera"})
-                return
-
-        if img_arr is None:
-            ui.send_message("capture_result", {"error": "Invalid image"})
-            return
-
-        if not EMOTION_AVAILABLE:
-            CAPTURE_IN_PROGRESS = False
-            ui.send_message("capture_result", {"error": "Emotion detection not available"})
-            return
-
-        emotion, emotions = _detect_emotion_from_frame(img_arr)
-        if emotion is None:
-            CAPTURE_IN_PROGRESS = False
-            ui.send_message("capture_result", {"error": "No face detected"})
+        job = capture_pipeline.submit("button" if client_id is None else "browser", data)
+        if job is None:
+            ui.send_message("capture_result", {"error": "Processing... please wait"})
             return
+        LAST_CAPTURE_TIME = current_time
 
-        # Update OLED/LCD eyes
-        try:
-            Bridge.call("setEmotion", emotion.upper(), float(emotions.get(emotion, 80)))
-        except Exception:
-            pass
-
-        ui.send_message("emotion_update", {
-            "emotion": emotion,
-            "emotions": emotions,
-            "timestamp": datetime.now(UTC).isoformat(),
-        })
-
-        # Only call Gemini if emotion changed significantly or cache expired
-        emotion_changed = emotion != LAST_EMOTION
-        cache_expired = (LAST_POEM is None or
-                         current_time - LAST_POEM_TIME > POEM_CACHE_TIME)
-        api_error = None
-        if emotion_changed or cache_expired:
-            poem, api_error = get_poem_for_emotion(emotion)
-            LAST_POEM = poem
-            LAST_EMOTION = emotion
-            LAST_POEM_TIME = current_time
-        else:
-            poem = LAST_POEM
-
-        ui.send_message("poem", {"emotion": emotion, "poem": poem, "api_error": api_error})
-        ui.send_message("capture_result", {
-            "ok": True,
-            "emotion": emotion,
-            "cooldown_remaining": CAPTURE_COOLDOWN,
-            "api_error": api_error,
-        })
-
-        def _speak_and_report():
-            tts_ok, tts_err = speak_text(poem)
-            if tts_err:
-                ui.send_message("tts_error", {"error": tts_err})
-
-        threading.Thread(target=_speak_and_report, daemon=True).start()
-
-    except Exception as e:
-        ui.send_message("capture_result", {"error": str(e)})
-    finally:
-        CAPTURE_IN_PROGRESS = False
+def on_capture_cancel(client_id, data=None):
+    data = data or {}
+    cancelled = capture_pipeline.cancel(data.get("job_id"))
+    ui.send_message("capture_cancel_result", {"ok": bool(cancelled), "job_ids": cancelled})
+
+def on_startup_status(client_id, data=None):
+    ui.send_message("startup_status", {"components": startup.status()})
+
+def on_stats(client_id, data=None):
+    """Per-stage latency summaries (p50/p95/p99 over a rolling window), event counters, the
+    speaker player's clip counts, the TTS cache's size, ready poems per emotion and how the pin-2
+    button is read ("poll" means the sketch is older firmware without button events)."""
+    ui.send_message("stats", {
+        **metrics.snapshot(),
+        "button": BUTTON_MODE,
+        "poem_pool": poem_pool.stats() if poem_pool else None,
+        "speaker": audio_player.stats() if audio_player else None,
+        "tts_cache": tts_cache.stats() if tts_cache else None,
+    })
+
+def on_tracking_stats(client_id, data=None):
+    ui.send_message("tracking_stats", {
+        "enabled": EMOTION_TRACKING,
+        "face_tracker": face_tracker.stats(),
+        "eyes": eye_channel.stats(),
+        "scene_gate": {"capture": scene_gate.stats(), "tracking": _tracking_gate.stats()},
+    })
 
 def on_bt_scan(client_id, data=None):
-    result = bluetooth_scan()
-    ui.send_message("bt_devices", result if isinstance(result, dict) else {"devices": result})
+    """Starts discovery and returns; devices stream in as bt_device_found, then bt_scan_done."""
+    if not bluetooth.available:
+        ui.send_message("bt_devices", {"devices": [], "error": "Bluetooth only available in SBC mode"})
+        return
+    bluetooth.scan(BT_SCAN_SECONDS)
+    ui.send_message("bt_devices", {"devices": bluetooth.devices(), "scanning": True})
 
 def on_bt_devices(client_id, data=None):
-    if not shutil.which("bluetoothctl"):
+    if not bluetooth.available:
         ui.send_message("bt_devices", {"devices": [], "error": "Bluetooth only available in SBC mode"})
         return
-    devices = bluetooth_devices()
-    ui.send_message("bt_devices", {"devices": devices})
+    ui.send_message("bt_devices", {"devices": bluetooth.devices()})
 
 def on_bt_pair(client_id, data=None):
     data = data or {}
@@ -593,8 +1044,7 @@ def on_bt_pair(client_id, data=None):
     if not mac:
         ui.send_message("bt_pair_result", {"ok": False, "error": "No MAC"})
         return
-    result = bluetooth_pair(mac)
-    ui.send_message("bt_pair_result", result)
+    bluetooth.pair(mac)  # bt_pair_result is sent when bluetoothctl answers
 
 def on_bt_connect(client_id, data=None):
     data = data or {}
@@ -602,13 +1052,14 @@ def on_bt_connect(client_id, data=None):
     if not mac:
         ui.send_message("bt_connect_result", {"ok": False, "error": "No MAC"})
         return
-    result = bluetooth_connect(mac)
-    ui.send_message("bt_connect_result", result)
+    bluetooth.connect(mac)  # bt_connect_result is sent when bluetoothctl answers
 
 def on_audio_sinks(client_id, data=None):
-    sinks = list_audio_sinks()
+    data = data or {}
+    # Cached list; only re-list when nothing is keeping it current (or the UI asks explicitly)
+    sinks = audio_devices.sinks(refresh=bool(data.get("refresh")) or not audio_devices.subscribed)
     err = None
-    if not shutil.which("pactl"):
+    if not audio_devices.has("pactl"):
         err = "PulseAudio not available - using fallback playback"
     ui.send_message("audio_sinks", {"sinks": sinks, "error": err})
 
@@ -621,28 +1072,101 @@ def on_set_audio_sink(client_id, data=None):
 
 # --- MJPEG server (stdlib only, no Flask) ---
 def run_mjpeg_server():
+    import socket
     from http.server import HTTPServer, BaseHTTPRequestHandler
     from socketserver import ThreadingMixIn
+    from urllib.parse import urlsplit
 
     class ThreadedHTTPServer(ThreadingMixIn, HTTPServer):
         daemon_threads = True
 
     class MJPEGHandler(BaseHTTPRequestHandler):
         def do_GET(self):
-            if self.path != "/stream":
+            url = urlsplit(self.path)
+            if url.path.startswith("/audio/"):
+                self._send_audio(url.path[len("/audio/"):])
+                return
+            if url.path == "/metrics":
+                self._send_metrics()
+                return
+            if url.path != "/stream":
                 self.send_error(404)
                 return
+            params = _stream_params(url.query)
+            # Send buffer of about one JPEG (Linux doubles it): a slow viewer blocks the write and then
+            # picks up the newest frame, instead of the kernel queueing seconds of stale ones
+            try:
+                self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, STREAM_SNDBUF)
+            except OSError:
+                pass
             self.send_response(200)
             self.send_header("Content-Type", "multipart/x-mixed-replace; boundary=frame")
             self.send_header("Cache-Control", "no-cache")
             self.end_headers()
             try:
-                for chunk in generate_frames():
+                for chunk in generate_frames(**params):
                     self.wfile.write(chunk)
                     self.wfile.flush()
             except (BrokenPipeError, ConnectionResetError):
                 pass
 
+        def _send_metrics(self):
+            body = metrics.prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def _send_audio(self, clip):
+            """Raw MP3 for a speech clip: cache/<key> from the TTS cache, <id> while it streams."""
+            stream = reader = None
+            if not clip.startswith("cache/"):
+                stream = audio_streams.get(clip)
+                reader = stream.reader() if stream is not None else None
+                if stream is not None and reader is None:
+                    clip = "cache/" + stream.cache_key  # finished and handed over to the TTS cache
+            if clip.startswith("cache/"):
+                key = clip[len("cache/"):]
+                clip_file = tts_cache.open(key) if (tts_cache and re.fullmatch(r"[0-9a-f]{64}", key)) else None
+                if clip_file is None:
+                    self.send_error(404)
+                    return
+                with clip_file:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "audio/mpeg")
+                    self.send_header("Content-Length", str(os.fstat(clip_file.fileno()).st_size))
+                    self.send_header("Cache-Control", "max-age=86400")  # content-addressed, never changes
+                    self.send_header("Access-Control-Allow-Origin", "*")
+                    self.end_headers()
+                    try:
+                        for data in _file_chunks(clip_file, TTS_CHUNK_BYTES):
+                            self.wfile.write(data)
+                    except (BrokenPipeError, ConnectionResetError):
+                        pass
+                return
+            if stream is None or (stream.done and stream.aborted):
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "audio/mpeg")
+            if stream.done:
+                self.send_header("Content-Length", str(stream.size))
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.end_headers()
+            try:
+                for data in reader:
+                    self.wfile.write(data)
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
         def log_message(self, format, *args):
             pass
 
@@ -653,7 +1177,11 @@ def run_mjpeg_server():
         print(f"MJPEG server error: {e}")
 
 # --- Register handlers ---
+ui.on_message("startup_status", on_startup_status)
 ui.on_message("capture", on_capture)
+ui.on_message("capture_cancel", on_capture_cancel)
+ui.on_message("tracking_stats", on_tracking_stats)
+ui.on_message("stats", on_stats)
 ui.on_message("bt_scan", on_bt_scan)
 ui.on_message("bt_devices", on_bt_devices)
 ui.on_message("bt_pair", on_bt_pair)
@@ -661,12 +1189,38 @@ ui.on_message("bt_connect", on_bt_connect)
 ui.on_message("audio_sinks", on_audio_sinks)
 ui.on_message("set_audio_sink", on_set_audio_sink)
 
-# --- Start MJPEG server ---
-threading.Thread(target=run_mjpeg_server, daemon=True).start()
+# --- Poem pool refill worker (started once Gemini/ElevenLabs are loaded) ---
+def _start_poem_pool():
+    global poem_pool
+    if not gemini_client or POEM_POOL_SIZE <= 0:
+        return False
+    startup.wait(("elevenlabs",))  # decides whether pooled poems are pre-synthesized
+    poem_pool = PoemPool(
+        get_poem_for_emotion, sorted(set(EMOTION_MAP.values())),
+        size=POEM_POOL_SIZE, path=POEM_POOL_PATH, min_interval=POEM_POOL_INTERVAL,
+        # Keep each emotion's next poem already synthesized so capture-to-voice skips ElevenLabs
+        prepare=synthesize_to_cache if (elevenlabs_client and tts_cache) else None,
+    ).start()
+
+def _start_tracking():
+    if not EMOTION_TRACKING:
+        return False
+    threading.Thread(target=_tracking_loop, name="emotion-tracking", daemon=True).start()
+
+# --- Arduino button (pin 2 triggers capture) ---
+BUTTON_MODE = "starting"  # "event" (sketch pushes buttonPressed) or "poll" (older firmware)
+
+def _on_button_pressed(*_):
+    """Bridge callback from the sketch's pin-2 interrupt; on_capture only queues a job."""
+    on_capture(None, {})
+
+try:
+    Bridge.provide("buttonPressed", _on_button_pressed)
+except Exception as e:
+    print(f"Bridge.provide(buttonPressed) failed: {e}")
 
-# --- Arduino button poll (pin 2 triggers capture) ---
 def _poll_button():
-    time.sleep(3)  # Wait for Bridge to be ready
+    """Fallback for firmware without enableButtonEvents: ask the sketch every 0.2 s."""
     while True:
         try:
             result = Bridge.call("getButtonPressed")
@@ -676,20 +1230,66 @@ def _poll_button():
             pass
         time.sleep(0.2)
 
-threading.Thread(target=_poll_button, daemon=True).start()
+def _start_button_input():
+    global BUTTON_MODE
+    time.sleep(3)  # Wait for Bridge to be ready
+    try:
+        if Bridge.call("enableButtonEvents"):
+            BUTTON_MODE = "event"
+            return
+    except Exception:
+        pass
+    BUTTON_MODE = "poll"
+    print("Button: sketch has no button events (older firmware), polling every 0.2 s")
+    _poll_button()
 
 # --- Main ---
 def _status(ok):
     return "[OK]" if ok else "[--]"
-print("Teddy Talk starting...")
-print(f"  {_status(EMOTION_AVAILABLE)} Emotion detection")
-print(f"  {_status(bool(gemini_client))} Gemini (poem generation)")
-print(f"  {_status(bool(elevenlabs_client))} ElevenLabs (TTS)")
-if not GEMINI_KEY:
-    print("  [!] No Gemini API key - add python/gemini_api_key.txt or GEMINI_API_KEY in .env")
-if not ELEVENLABS_KEY:
-    print("  [!] No ElevenLabs API key - add python/elevenlabs_api_key.txt or ELEVENLABS_API_KEY in .env")
-print(f"  {_status(bool(cv2))} OpenCV / camera")
-print(f"  {_status(shutil.which('bluetoothctl') is not None)} bluetoothctl")
-print(f"  {_status(shutil.which('pactl') is not None)} pactl (audio)")
-App.run()
+
+def _print_status():
+    """Component summary and startup timing, printed once every loader has settled."""
+    startup.wait()
+    print(f"  {_status(EMOTION_AVAILABLE)} Emotion detection ({getattr(face_detector, 'name', '-')} face detector)")
+    if not EMOTION_AVAILABLE:
+        print(f"  -> Install deps: pip install -r {os.path.join(_script_dir, 'requirements.txt')}")
+    print(f"  {_status(EMOTION_TRACKING and EMOTION_AVAILABLE)} Continuous emotion tracking ({TRACKING_FPS:g} fps)")
+    print(f"  {_status(bool(gemini_client))} Gemini (poem generation)")
+    print(f"  {_status(bool(poem_pool))} Poem pool ({POEM_POOL_SIZE} per emotion)")
+    print(f"  {_status(bool(elevenlabs_client))} ElevenLabs (TTS)")
+    if not GEMINI_KEY:
+        print("  [!] No Gemini API key - add python/gemini_api_key.txt or GEMINI_API_KEY in .env")
+    if not ELEVENLABS_KEY:
+        print("  [!] No ElevenLabs API key - add python/elevenlabs_api_key.txt or ELEVENLABS_API_KEY in .env")
+    print(f"  {_status(bool(cv2))} OpenCV / camera")
+    print(f"  {_status(bluetooth.available)} bluetoothctl ({bluetooth.binary})")
+    print(f"  {_status(bool(audio_player))} Speaker playback (output: {AUDIO_OUTPUT}{', ' + audio_player.backend if audio_player else ''})")
+    print(f"  {_status(audio_devices.has('pactl'))} pactl (audio{', following sink changes' if audio_devices.has('pactl') else ''})")
+    print(startup.report())
+
+def main():
+    print("Teddy Talk starting...")
+    # UI-facing servers first, so port 7000/7001 answer while the models load
+    startup.step("mjpeg_server", lambda: threading.Thread(target=run_mjpeg_server, name="mjpeg", daemon=True).start())
+    # Follow PulseAudio sink changes (BT speaker connect/disconnect)
+    startup.step("audio_devices", audio_devices.start)
+
+    # Heavy components load concurrently; dependents start when what they need is ready
+    startup.load("opencv", _load_opencv)
+    startup.load("face_detector", _load_face_detector, warmup=_warm_up_detector, after=("opencv",))
+    startup.load("emotion_recognizer", _load_emotion_recognizer, warmup=_warm_up_recognizer, after=("opencv",))
+    startup.load("emotion", _enable_emotion, after=EMOTION_COMPONENTS)
+    startup.load("gemini", _load_gemini)
+    startup.load("elevenlabs", _load_elevenlabs)
+    startup.load("poem_pool", _start_poem_pool, after=("gemini",))
+    startup.load("tracking", _start_tracking, after=("emotion",))
+
+    threading.Thread(target=_start_button_input, name="button", daemon=True).start()
+    threading.Thread(target=_print_status, name="startup-report", daemon=True).start()
+    try:
+        App.run()
+    finally:
+        bluetooth.close()  # quit bluetoothctl (and any running scan) with the app
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Lightweight latency instrumentation.
+  with metrics.timer("face_detect"): ...   - records a duration
+  metrics.observe("capture.poem", ms)      - records a duration measured elsewhere
+  metrics.inc("tts_cache_hit")             - bumps a counter
+Each timer keeps a rolling window of recent samples (p50/p95/p99 over the window) plus
+lifetime count and sum. snapshot() feeds the "stats" UI message, prometheus() the /metrics route.
+"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class Histogram:
+    def __init__(self, window=512):
+        self._samples = deque(maxlen=window)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms):
+        self._samples.append(ms)
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def quantile(self, q):
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "p50_ms": round(self.quantile(0.5), 2),
+            "p95_ms": round(self.quantile(0.95), 2),
+            "p99_ms": round(self.quantile(0.99), 2),
+            "max_ms": round(self.max_ms, 2),
+        }
+
+
+class Metrics:
+    def __init__(self, window=512):
+        self.window = window
+        self._lock = threading.Lock()
+        self._timers = {}
+        self._counters = {}
+
+    def observe(self, name, ms):
+        with self._lock:
+            hist = self._timers.get(name)
+            if hist is None:
+                hist = self._timers[name] = Histogram(self.window)
+            hist.add(float(ms))
+
+    @contextmanager
+    def timer(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - started) * 1000.0)
+
+    def inc(self, name, n=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def reset(self):
+        with self._lock:
+            self._timers.clear()
+            self._counters.clear()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "timers": {name: hist.summary() for name, hist in sorted(self._timers.items())},
+                "counters": dict(sorted(self._counters.items())),
+            }
+
+    def prometheus(self, prefix="teddy"):
+        """Prometheus text exposition: one summary for all timers, one counter family."""
+        lines = [
+            f"# HELP {prefix}_stage_seconds Stage latency (quantiles over the last {self.window} samples).",
+            f"# TYPE {prefix}_stage_seconds summary",
+        ]
+        with self._lock:
+            timers = sorted(self._timers.items())
+            counters = sorted(self._counters.items())
+            for name, hist in timers:
+                for q in (0.5, 0.95, 0.99):
+                    lines.append(f'{prefix}_stage_seconds{{stage="{name}",quantile="{q}"}} {hist.quantile(q) / 1000.0:.6f}')
+                lines.append(f'{prefix}_stage_seconds_sum{{stage="{name}"}} {hist.total_ms / 1000.0:.6f}')
+                lines.append(f'{prefix}_stage_seconds_count{{stage="{name}"}} {hist.count}')
+        lines.append(f"# HELP {prefix}_events_total Event counters.")
+        lines.append(f"# TYPE {prefix}_events_total counter")
+        for name, value in counters:
+            lines.append(f'{prefix}_events_total{{event="{name}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()  # process-wide registry shared by every module
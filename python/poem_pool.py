@@ -0,0 +1,176 @@
+"""
+Pre-generated poem pool.
+Keeps up to `size` ready poems per emotion, persisted to JSON across restarts.
+Captures take a poem instantly; a background worker refills the emptiest emotion
+first, no faster than one generation call per `min_interval` seconds.
+With a `prepare` hook (e.g. TTS pre-synthesis) the worker first makes sure the
+next poem of every emotion is prepared, so the poem a capture takes is ready to speak.
+A poem whose prepare fails is retried with exponential backoff; meanwhile refills go on
+and the poem is still served (just unprepared).
+While an emotion's pool is empty, take(reuse_last=True) replays the poem last served for it
+so a capture doesn't have to wait for a generation call.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+
+
+class PoemPool:
+    def __init__(self, generate, emotions, size=3, path=None, min_interval=6.0, error_backoff=60.0, prepare=None,
+                 max_prepare_backoff=3600.0):
+        """generate: callable(emotion) -> (poem, error); only error-free poems are pooled.
+        prepare: optional callable(poem) -> bool, run for each emotion's next poem; should be
+        cheap when the poem is already prepared (it is re-checked after restarts)."""
+        self.generate = generate
+        self.prepare = prepare
+        self._prepared = set()
+        self._prepare_failures = {}  # poem -> (failures, retry_at)
+        self.max_prepare_backoff = max_prepare_backoff
+        self.size = size
+        self.path = path
+        self.min_interval = min_interval
+        self.error_backoff = error_backoff
+        self._pools = {e: deque() for e in emotions}
+        self._last = {}  # emotion -> poem last served (in memory only)
+        self._dirty = False  # pools changed since the last save (saved by the refill worker)
+        self._cond = threading.Condition()
+        self._running = False
+        self._last_call = 0.0
+        self._load()
+
+    def _load(self):
+        if not self.path or not os.path.isfile(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            for emotion, poems in saved.items():
+                if emotion in self._pools:
+                    self._pools[emotion].extend(p for p in poems[: self.size] if isinstance(p, str) and p)
+        except (OSError, ValueError) as e:
+            print(f"Poem pool load failed: {e}")
+
+    def _save(self):
+        """Persist the pool if it changed. Called on the refill worker without the lock held,
+        so take() never waits on disk I/O."""
+        with self._cond:
+            if not self._dirty:
+                return
+            self._dirty = False
+            saved = {e: list(p) for e, p in self._pools.items()}
+        if not self.path:
+            return
+        tmp = self.path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(saved, f, ensure_ascii=False, indent=1)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"Poem pool save failed: {e}")
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return self
+            self._running = True
+        threading.Thread(target=self._run, name="poem-pool", daemon=True).start()
+        return self
+
+    def take(self, emotion, reuse_last=False):
+        """Pop a ready poem for emotion, or None if the pool is empty. Wakes the refill worker.
+        reuse_last: when the pool is empty, return the poem last served for emotion (if any)."""
+        with self._cond:
+            pool = self._pools.get(emotion)
+            if not pool:
+                self._cond.notify_all()
+                return self._last.get(emotion) if reuse_last else None
+            poem = self._last[emotion] = pool.popleft()
+            self._prepared.discard(poem)
+            self._prepare_failures.pop(poem, None)
+            self._dirty = True
+            self._cond.notify_all()
+            return poem
+
+    def _next_emotion(self):
+        """Emotion with the fewest ready poems, or None if every pool is full."""
+        emotion = min(self._pools, key=lambda e: len(self._pools[e]))
+        return emotion if len(self._pools[emotion]) < self.size else None
+
+    def _unprepared(self):
+        """[(emotion, poem)] for next-up poems that haven't been prepared yet."""
+        if not self.prepare:
+            return []
+        return [(e, pool[0]) for e, pool in self._pools.items() if pool and pool[0] not in self._prepared]
+
+    def _next_unprepared(self, now):
+        """(emotion, poem) for a next-up unprepared poem that is not backing off, or None."""
+        for emotion, poem in self._unprepared():
+            if self._prepare_failures.get(poem, (0, 0.0))[1] <= now:
+                return emotion, poem
+        return None
+
+    def _next_retry_in(self, now):
+        """Seconds until a backed-off poem may be prepared again, or None if none is waiting."""
+        retries = [self._prepare_failures[p][1] for _, p in self._unprepared() if p in self._prepare_failures]
+        return max(0.0, min(retries) - now) if retries else None
+
+    def _prepare(self, emotion, poem):
+        try:
+            ok = self.prepare(poem)
+        except Exception as e:
+            print(f"Poem pool prepare failed ({emotion}): {e}")
+            ok = False
+        with self._cond:
+            if ok:
+                self._prepared.add(poem)
+                self._prepare_failures.pop(poem, None)
+                return
+            # Back off this poem only; refills for every emotion carry on meanwhile
+            failures = self._prepare_failures.get(poem, (0, 0.0))[0] + 1
+            delay = min(self.error_backoff * 2 ** (failures - 1), self.max_prepare_backoff)
+            self._prepare_failures[poem] = (failures, time.time() + delay)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running:
+                    now = time.time()
+                    unprepared = self._next_unprepared(now)
+                    emotion = self._next_emotion()
+                    if unprepared or emotion or self._dirty:
+                        break
+                    self._cond.wait(self._next_retry_in(now))
+                if not self._running:
+                    return
+                wait = self._last_call + self.min_interval - time.time()
+            self._save()
+            if not unprepared and not emotion:
+                continue  # woken only to save
+            if unprepared:
+                # Next-up poems first: the one a capture takes should already be ready to speak
+                self._prepare(*unprepared)
+                continue
+            if wait > 0:
+                time.sleep(wait)
+            self._last_call = time.time()
+            try:
+                poem, err = self.generate(emotion)
+            except Exception as e:
+                poem, err = None, str(e)
+            if err or not poem:
+                print(f"Poem pool refill failed ({emotion}): {err}")
+                time.sleep(self.error_backoff)
+                continue
+            with self._cond:
+                pool = self._pools[emotion]
+                if poem not in pool and len(pool) < self.size:
+                    pool.append(poem)
+                    self._dirty = True
+
+    def stats(self):
+        with self._cond:
+            return {e: {"ready": len(p), "prepared": bool(p) and p[0] in self._prepared}
+                    for e, p in self._pools.items()}
@@ -0,0 +1,89 @@
+"""
+Scene-change gate: skip face detection + FER+ on frames that show nothing new.
+Each frame is reduced to a small gray thumbnail (area-averaged, so sensor noise mostly cancels
+out). If its mean absolute difference (0-255) from the thumbnail of the last analysed frame is
+under `threshold`, and so are the face regions of the stored result (an expression change can be
+too small to move the whole-scene average), the stored result is reused. Results expire after
+max_age seconds; a threshold of 0 disables the gate.
+"""
+import threading
+import time
+
+THUMB_SIZE = (32, 24)
+FACE_THUMB_SIZE = (16, 16)
+
+
+def thumbnail(frame, size=THUMB_SIZE, box=None):
+    """Gray int16 thumbnail of the frame (or of box=(x, y, w, h) within it)."""
+    import cv2
+    import numpy as np
+    if box is not None:
+        x, y, w, h = (int(v) for v in box)
+        frame = frame[max(0, y):y + h, max(0, x):x + w]
+        if not frame.size:
+            return None
+    small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+    if small.ndim == 3:
+        small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    return small.astype(np.int16)
+
+
+def difference(a, b):
+    """Mean absolute difference of two thumbnails; inf if either is missing or they don't match."""
+    if a is None or b is None or a.shape != b.shape:
+        return float("inf")
+    import numpy as np
+    return float(np.abs(a - b).mean())
+
+
+class SceneGate:
+    def __init__(self, threshold=3.0, max_age=60.0, face_threshold=None):
+        """face_threshold: limit for the face regions (default: same as threshold)."""
+        self.threshold = threshold
+        self.face_threshold = threshold if face_threshold is None else face_threshold
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._scene = None
+        self._faces = []    # [(box, thumbnail)] of the stored result
+        self._result = None
+        self._stored = 0.0
+        self._stats = {"reused": 0, "analysed": 0}
+
+    def lookup(self, frame):
+        """The stored result if `frame` shows the same scene, else None (run the models, then store())."""
+        if self.threshold <= 0:
+            return None
+        with self._lock:
+            scene, faces, result, stored = self._scene, self._faces, self._result, self._stored
+        if scene is None or time.time() - stored > self.max_age:
+            return self._miss()
+        if difference(thumbnail(frame), scene) >= self.threshold:
+            return self._miss()
+        for box, face in faces:
+            if difference(thumbnail(frame, FACE_THUMB_SIZE, box), face) >= self.face_threshold:
+                return self._miss()
+        with self._lock:
+            self._stats["reused"] += 1
+        return result
+
+    def _miss(self):
+        with self._lock:
+            self._stats["analysed"] += 1
+        return None
+
+    def store(self, frame, result, boxes=()):
+        """Remember the result for `frame`; boxes are the face regions that must also stay still."""
+        if self.threshold <= 0:
+            return
+        scene = thumbnail(frame)
+        faces = [(box, thumbnail(frame, FACE_THUMB_SIZE, box)) for box in boxes]
+        with self._lock:
+            self._scene, self._faces, self._result, self._stored = scene, faces, result, time.time()
+
+    def reset(self):
+        with self._lock:
+            self._scene, self._faces, self._result = None, [], None
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, threshold=self.threshold, enabled=self.threshold > 0)
@@ -0,0 +1,111 @@
+"""
+Startup orchestrator.
+Heavy components (OpenCV, face detector, FER+ session, API clients) load concurrently in
+background threads, each optionally after the components it depends on, so the web UI and
+MJPEG server answer right away. Readiness is tracked per component and reported through
+on_change(status); report() gives the timing summary printed once everything settled.
+"""
+import importlib.util
+import threading
+import time
+
+PENDING, LOADING, READY, FAILED, SKIPPED = "pending", "loading", "ready", "failed", "skipped"
+
+
+def missing_modules(names):
+    """Modules from `names` that are not installed, probed with find_spec (nothing is imported)."""
+    missing = []
+    for name in names:
+        try:
+            if importlib.util.find_spec(name) is None:
+                missing.append(name)
+        except (ImportError, ValueError):
+            missing.append(name)
+    return missing
+
+
+class Startup:
+    def __init__(self, on_change=None):
+        self.on_change = on_change
+        self.started = time.time()
+        self._cond = threading.Condition()
+        self._components = {}  # name -> {"state", "ms", "error"}
+
+    def _set(self, name, state, **info):
+        with self._cond:
+            entry = self._components.setdefault(name, {})
+            entry.update(state=state, **info)
+            self._cond.notify_all()
+        if self.on_change:
+            try:
+                self.on_change(self.status())
+            except Exception as e:
+                print(f"Startup status callback failed: {e}")
+
+    def step(self, name, fn):
+        """Run fn now, on the calling thread, and record its timing."""
+        self._set(name, LOADING)
+        return self._run(name, fn, None)
+
+    def load(self, name, fn, warmup=None, after=()):
+        """Run fn (then warmup(result)) on a background thread once every component in `after`
+        is ready. fn returning False marks the component skipped (e.g. no API key)."""
+        self._set(name, PENDING)
+        threading.Thread(target=self._load, args=(name, fn, warmup, tuple(after)),
+                         name=f"startup-{name}", daemon=True).start()
+
+    def _load(self, name, fn, warmup, after):
+        if after and not self.wait(after):
+            blocked = [n for n in after if self.state(n) != READY]
+            self._set(name, SKIPPED, error=f"needs {', '.join(blocked)}")
+            return
+        self._set(name, LOADING)
+        self._run(name, fn, warmup)
+
+    def _run(self, name, fn, warmup):
+        started = time.time()
+        try:
+            result = fn()
+            if result is False:
+                self._set(name, SKIPPED, ms=round((time.time() - started) * 1000.0))
+                return result
+            if warmup:
+                warmup(result)
+        except Exception as e:
+            print(f"{name} failed to load: {e}")
+            self._set(name, FAILED, ms=round((time.time() - started) * 1000.0), error=str(e))
+            return None
+        self._set(name, READY, ms=round((time.time() - started) * 1000.0))
+        return result
+
+    def state(self, name):
+        with self._cond:
+            return self._components.get(name, {}).get("state")
+
+    def wait(self, names=None, timeout=None):
+        """Block until the components have settled; True if all of them are ready."""
+        deadline = None if timeout is None else time.time() + timeout
+        with self._cond:
+            while True:
+                # Unknown names count as settled (not ready), so callers never wait on a loader that was never started
+                states = [self._components.get(n, {}).get("state") for n in (names or list(self._components))]
+                if all(s in (READY, FAILED, SKIPPED, None) for s in states):
+                    return all(s == READY for s in states)
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+
+    def status(self):
+        with self._cond:
+            return {name: dict(entry) for name, entry in self._components.items()}
+
+    def report(self):
+        """Per-component timing lines plus the total since the orchestrator was created."""
+        lines = [f"Startup finished in {time.time() - self.started:.2f} s"]
+        for name, entry in self.status().items():
+            ms = entry.get("ms")
+            timing = f"{ms:6d} ms" if ms is not None else "     - ms"
+            error = f"  ({entry['error']})" if entry.get("error") else ""
+            lines.append(f"  {timing}  {name:20s} {entry['state']}{error}")
+        return "\n".join(lines)
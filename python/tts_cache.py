@@ -0,0 +1,108 @@
+"""
+Content-addressed on-disk cache for synthesized speech.
+Key = hash of (text, voice, model, output format), so a repeat reading replays
+from disk with no API call. Total size is capped; least recently used clips go first.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+
+class AudioCache:
+    def __init__(self, directory, max_bytes=50 * 1024 * 1024, ext=".mp3"):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ext = ext
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> size, least recently used first
+        self._total = 0
+        os.makedirs(directory, exist_ok=True)
+        self._scan()
+
+    @staticmethod
+    def key(text, voice_id, model_id, output_format):
+        blob = json.dumps([text, voice_id, model_id, output_format], ensure_ascii=False)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + self.ext)
+
+    def _scan(self):
+        """Rebuild the LRU index from disk (file mtime = last use)."""
+        found = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(self.ext):
+                continue
+            try:
+                st = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            found.append((st.st_mtime, name[: -len(self.ext)], st.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total += size
+        self._evict()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def open(self, key):
+        """Cached clip opened for reading (caller closes it), or None. A hit marks the clip as
+        most recently used. The open file stays readable even if the clip is evicted meanwhile."""
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+        path = self._path(key)
+        try:
+            f = open(path, "rb")
+        except OSError:
+            self._forget(key)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return f
+
+    def put(self, key, data):
+        """Store a clip; False if it could not be written."""
+        path = self._path(key)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)  # atomic: readers never see a half-written clip
+        except OSError as e:
+            print(f"TTS cache write failed: {e}")
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return False
+        with self._lock:
+            self._total += len(data) - self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._evict()
+        return True
+
+    def _forget(self, key):
+        with self._lock:
+            self._total -= self._entries.pop(key, 0)
+
+    def _evict(self):
+        """Drop least recently used clips until under max_bytes (caller holds the lock or is __init__)."""
+        while self._total > self.max_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self._total -= size
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def stats(self):
+        with self._lock:
+            return {"clips": len(self._entries), "bytes": self._total, "max_bytes": self.max_bytes}
@@ -0,0 +1,59 @@
+"""
+Face analysis core shared by the app and the offline benchmarks.
+Detect every face, crop with padding and score all crops in one batched FER+ call.
+Nothing here touches the camera, the Bridge or the network, so it runs on any dev box.
+"""
+from emotion_loader import LABELS
+from metrics import metrics
+
+# FER+ labels -> internal emotion names
+EMOTION_MAP = {
+    "anger": "angry", "contempt": "contempt", "disgust": "disgust",
+    "fear": "fear", "happiness": "happy", "neutral": "neutral",
+    "sadness": "sad", "surprise": "surprise",
+}
+
+
+def scores_to_percent(scores):
+    return {EMOTION_MAP.get(lab, lab): float(s) * 100 for lab, s in zip(LABELS, scores)}
+
+
+def crop_face(frame, box):
+    x, y, w, h = box
+    # Add padding (~15%) so face isn't cropped too tight - improves FER+ accuracy
+    pad = int(0.15 * max(w, h))
+    x1 = max(0, x - pad)
+    y1 = max(0, y - pad)
+    x2 = min(frame.shape[1], x + w + pad)
+    y2 = min(frame.shape[0], y + h + pad)
+    return frame[y1:y2, x1:x2]
+
+
+def score_faces(frame, detect, recognizer):
+    """detect(frame) -> boxes (a detector's detect or a FaceTracker's process).
+    Returns [(box, label, scores)] with raw FER+ probability vectors, largest face first."""
+    faces = detect(frame)
+    if not len(faces):
+        return []
+    boxes = sorted((tuple(int(v) for v in f) for f in faces), key=lambda r: r[2] * r[3], reverse=True)
+    crops = [crop_face(frame, box) for box in boxes]
+    with metrics.timer("fer.predict"):
+        results = recognizer.predict_emotions_batch(crops, logits=False, color="bgr")
+    return [(box, label, scores) for box, (label, scores) in zip(boxes, results)]
+
+
+def face_result(box, label, scores):
+    return {"box": list(box), "emotion": EMOTION_MAP.get(label, label.lower()), "emotions": scores_to_percent(scores)}
+
+
+def analyze_faces(frame, detect, recognizer):
+    """Returns [{"box": [x, y, w, h], "emotion": str, "emotions": {emotion: percent}}], largest face first."""
+    return [face_result(*face) for face in score_faces(frame, detect, recognizer)]
+
+
+def detect_emotion(frame, detect, recognizer):
+    """Emotion of the largest face: (emotion, {emotion: percent}) or (None, {})."""
+    faces = analyze_faces(frame, detect, recognizer)
+    if not faces:
+        return None, {}
+    return faces[0]["emotion"], faces[0]["emotions"]
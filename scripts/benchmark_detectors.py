@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Compare face detector backends (haar, yunet, onnx) on a folder of images.
+Reports mean / p95 latency per image and faces found, plus agreement with the first backend and
+with the per-image face counts in <images>/baseline.json (shipped for the python/samples fixtures).
+Usage: python scripts/benchmark_detectors.py [--images python/samples] [--backends haar,yunet,onnx] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, os.path.join(APP_ROOT, "python"))
+
+_IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+def load_images(folder):
+    import cv2
+    images = []
+    for name in sorted(os.listdir(folder)):
+        if name.lower().endswith(_IMAGE_EXTS):
+            img = cv2.imread(os.path.join(folder, name), cv2.IMREAD_COLOR)
+            if img is not None:
+                images.append((name, img))
+    return images
+
+
+def bench(detector, images, repeat):
+    times = []
+    counts = {}
+    for name, img in images:
+        detector.detect(img)  # warm-up
+        for _ in range(repeat):
+            started = time.perf_counter()
+            faces = detector.detect(img)
+            times.append((time.perf_counter() - started) * 1000.0)
+        counts[name] = len(faces)
+    times.sort()
+    return {
+        "mean_ms": sum(times) / len(times),
+        "p95_ms": times[min(len(times) - 1, int(0.95 * len(times)))],
+        "faces": sum(counts.values()),
+        "counts": counts,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--images", default=os.path.join(APP_ROOT, "python", "samples"),
+                        help="folder of sample images (jpg/png)")
+    parser.add_argument("--backends", default="haar,yunet,onnx")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    from face_detectors import load_face_detector
+
+    if not os.path.isdir(args.images):
+        print(f"No image folder at {args.images} - add a few face photos there or pass --images")
+        return 1
+    images = load_images(args.images)
+    if not images:
+        print(f"No images found in {args.images}")
+        return 1
+
+    print(f"{len(images)} images, {args.repeat} runs each")
+    results = {}
+    for backend in [b.strip() for b in args.backends.split(",") if b.strip()]:
+        detector = load_face_detector(backend)
+        if detector.name != backend:
+            print(f"  {backend:6s} skipped (not available)")
+            continue
+        results[backend] = bench(detector, images, args.repeat)
+
+    if not results:
+        return 1
+    reference = next(iter(results.values()))["counts"]
+    baseline = {}
+    baseline_path = os.path.join(args.images, "baseline.json")
+    if os.path.isfile(baseline_path):
+        with open(baseline_path) as f:
+            baseline = json.load(f).get("faces", {})
+    print(f"  {'backend':8s} {'mean ms':>9s} {'p95 ms':>9s} {'faces':>6s} {'agree':>7s} {'baseline':>9s}")
+    for backend, r in results.items():
+        agree = sum(1 for name, n in r["counts"].items() if n == reference.get(name)) / len(images)
+        known = [name for name in r["counts"] if name in baseline]
+        vs_baseline = (f"{sum(1 for name in known if r['counts'][name] == baseline[name]) / len(known):9.0%}"
+                       if known else f"{'-':>9s}")
+        print(f"  {backend:8s} {r['mean_ms']:9.1f} {r['p95_ms']:9.1f} {r['faces']:6d} {agree:7.0%} {vs_baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Replay recorded images or a video through the vision pipeline (face detection + FER+) offline.
+No camera and no network: fetch the models first (scripts/download_models.py).
+Reports throughput, per-stage latency, peak memory and label agreement with a stored baseline.
+Usage: python scripts/benchmark_vision.py [--images python/samples | --video clip.mp4]
+         [--detector haar] [--threads 2] [--batch 4] [--repeat 3] [--save-baseline]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, os.path.join(APP_ROOT, "python"))
+sys.path.insert(0, SCRIPT_DIR)
+
+
+def load_video(path, every=1, max_frames=None):
+    import cv2
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        return []
+    frames = []
+    index = 0
+    while max_frames is None or len(frames) < max_frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        if index % every == 0:
+            frames.append((f"frame{index:06d}", frame))
+        index += 1
+    cap.release()
+    return frames
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process so far, or None where resource is unavailable (Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024.0 * 1024.0) if sys.platform == "darwin" else peak / 1024.0  # bytes on macOS, KB elsewhere
+
+
+def percentile(times, q):
+    ordered = sorted(times)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+def run_pipeline(frames, detect, recognizer, repeat):
+    """Full frame -> emotion path, as a capture runs it. Returns ({name: label}, frame times in ms)."""
+    from metrics import metrics
+    from vision import detect_emotion
+
+    labels = {}
+    times = []
+    for run in range(repeat):
+        for name, frame in frames:
+            started = time.perf_counter()
+            emotion, _ = detect_emotion(frame, detect, recognizer)
+            ms = (time.perf_counter() - started) * 1000.0
+            metrics.observe("frame", ms)
+            times.append(ms)
+            if run == 0:
+                labels[name] = emotion
+    return labels, times
+
+
+def run_recognizer(crops, recognizer, batch, repeat):
+    """FER+ alone over the detected crops, `batch` faces per call. Returns per-call times in ms."""
+    times = []
+    for _ in range(repeat):
+        for start in range(0, len(crops), batch):
+            part = crops[start:start + batch]
+            started = time.perf_counter()
+            if batch == 1:
+                recognizer.predict_emotions(part[0], color="bgr")
+            else:
+                recognizer.predict_emotions_batch(part, color="bgr")
+            times.append((time.perf_counter() - started) * 1000.0)
+    return times
+
+
+def compare(values, baseline):
+    """Share of frames (present in both runs) whose value matches the baseline, plus the mismatches."""
+    baseline = baseline or {}
+    common = [name for name in values if name in baseline]
+    mismatches = [(name, baseline[name], values[name]) for name in common if baseline[name] != values[name]]
+    agree = 1.0 - len(mismatches) / len(common) if common else None
+    return agree, mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--images", default=os.path.join(APP_ROOT, "python", "samples"),
+                        help="folder of recorded frames (jpg/png)")
+    parser.add_argument("--video", help="recorded video to replay instead of --images")
+    parser.add_argument("--every", type=int, default=1, help="use every Nth video frame")
+    parser.add_argument("--max-frames", type=int, default=None)
+    parser.add_argument("--detector", default=None, help="haar | yunet | onnx (default TEDDY_FACE_DETECTOR, else haar)")
+    parser.add_argument("--precision", default=None, help="FER+ model: fp32 | int8 (default TEDDY_FER_PRECISION)")
+    parser.add_argument("--threads", type=int, default=None, help="intra-op threads (default: env / half the cores)")
+    parser.add_argument("--inter-threads", type=int, default=None, help="inter-op threads (parallel mode only)")
+    parser.add_argument("--batch", type=int, default=1,
+                        help="faces per FER+ call in the recognizer run (a model with a fixed batch dim, "
+                             "like the Model Zoo fp32 export, still runs them one session.run each)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", default=None,
+                        help="baseline labels JSON (default: baseline.json in the image folder / <video>.baseline.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="write this run's labels as the new baseline")
+    parser.add_argument("--json", dest="json_path", help="also write the full report to this file")
+    args = parser.parse_args()
+
+    from benchmark_detectors import load_images
+    from emotion_loader import load_emotion_recognizer
+    from face_detectors import load_face_detector
+    from metrics import metrics
+    from vision import crop_face
+
+    if args.video:
+        frames = load_video(args.video, max(1, args.every), args.max_frames)
+        source = args.video
+        baseline_path = args.baseline or os.path.splitext(args.video)[0] + ".baseline.json"
+    else:
+        if not os.path.isdir(args.images):
+            print(f"No image folder at {args.images} - add a few face photos there or pass --images / --video")
+            return 1
+        frames = load_images(args.images)
+        source = args.images
+        baseline_path = args.baseline or os.path.join(args.images, "baseline.json")
+    if not frames:
+        print(f"No frames found in {source}")
+        return 1
+
+    rss_before = peak_rss_mb()
+    started = time.perf_counter()
+    detector = load_face_detector(args.detector)
+    if args.detector and detector.name != args.detector.strip().lower():
+        print(f"Detector '{args.detector}' not available")
+        return 1
+    recognizer = load_emotion_recognizer(precision=args.precision, intra_op_threads=args.threads,
+                                         inter_op_threads=args.inter_threads)
+    load_ms = (time.perf_counter() - started) * 1000.0
+
+    def detect(frame):
+        with metrics.timer("face_detect"):
+            return detector.detect(frame)
+
+    # Warm-up outside the measurements (first session.run allocates its arenas)
+    run_pipeline(frames[:1], detect, recognizer, 1)
+    metrics.reset()
+
+    started = time.perf_counter()
+    labels, frame_times = run_pipeline(frames, detect, recognizer, args.repeat)
+    pipeline_s = time.perf_counter() - started
+    stages = metrics.snapshot()["timers"]  # before the recognizer run adds its own fer.* samples
+
+    crops = []
+    face_counts = {}
+    for name, frame in frames:
+        boxes = detector.detect(frame)
+        face_counts[name] = len(boxes)
+        crops.extend(crop_face(frame, box) for box in boxes or [(0, 0, frame.shape[1], frame.shape[0])])
+    batch = max(1, args.batch)
+    model_batch = getattr(recognizer, "batch_size", None)
+    started = time.perf_counter()
+    call_times = run_recognizer(crops, recognizer, batch, args.repeat)
+    recognizer_s = time.perf_counter() - started
+
+    baseline = None
+    if os.path.isfile(baseline_path):
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+    agree, mismatches = compare(labels, baseline.get("labels")) if baseline is not None else (None, [])
+    faces_agree, face_mismatches = compare(face_counts, baseline.get("faces")) if baseline is not None else (None, [])
+
+    report = {
+        "source": source,
+        "frames": len(frames),
+        "faces": sum(face_counts.values()),
+        "detector": detector.name,
+        "threads": args.threads,
+        "batch": batch,
+        "model_batch": model_batch,
+        "repeat": args.repeat,
+        "load_ms": round(load_ms, 1),
+        "pipeline_fps": round(len(frame_times) / pipeline_s, 2) if pipeline_s else 0.0,
+        "recognizer_faces_per_s": round(len(crops) * args.repeat / recognizer_s, 2) if recognizer_s else 0.0,
+        "recognizer_call_ms": {"mean": round(sum(call_times) / len(call_times), 2) if call_times else 0.0,
+                               "p95": round(percentile(call_times, 0.95), 2)},
+        "stages": stages,
+        "rss_mb": {"before_models": rss_before, "peak": peak_rss_mb()},
+        "baseline": baseline_path if baseline is not None else None,
+        "agreement": agree,
+        "face_agreement": faces_agree,
+        "labels": labels,
+    }
+
+    print(f"{len(frames)} frames ({report['faces']} faces) from {source}, {args.repeat} runs each")
+    batch_note = f" (model batch fixed at {model_batch}: runs in chunks of {model_batch})" if model_batch and model_batch < batch else ""
+    print(f"  detector {detector.name}, threads {args.threads or 'default'}, batch {batch}{batch_note}, models loaded in {load_ms:.0f} ms")
+    print(f"  pipeline   {report['pipeline_fps']:8.1f} frames/s")
+    print(f"  recognizer {report['recognizer_faces_per_s']:8.1f} faces/s "
+          f"({report['recognizer_call_ms']['mean']:.1f} ms/call mean, {report['recognizer_call_ms']['p95']:.1f} p95)")
+    print(f"  {'stage':22s} {'count':>6s} {'mean ms':>9s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s}")
+    for stage, s in report["stages"].items():
+        print(f"  {stage:22s} {s['count']:6d} {s['mean_ms']:9.2f} {s['p50_ms']:9.2f} {s['p95_ms']:9.2f} {s['p99_ms']:9.2f}")
+    if report["rss_mb"]["peak"] is not None:
+        print(f"  peak RSS {report['rss_mb']['peak']:.0f} MB ({rss_before:.0f} MB before loading models)")
+    if baseline is None:
+        print(f"  no baseline at {baseline_path} (run with --save-baseline to record one)")
+    for what, score, wrong in (("face count", faces_agree, face_mismatches), ("label", agree, mismatches)):
+        if baseline is not None and score is None:
+            print(f"  baseline has no {what}s (record them with --save-baseline)")
+        elif score is not None:
+            print(f"  {what} agreement with baseline: {score:.0%}")
+            for name, expected, got in wrong[:10]:
+                print(f"    {name}: {expected} -> {got}")
+
+    if args.save_baseline:
+        with open(baseline_path, "w") as f:
+            json.dump({"detector": detector.name, "precision": args.precision or os.environ.get("TEDDY_FER_PRECISION") or "fp32",
+                       "faces": face_counts, "labels": labels}, f, indent=2, sort_keys=True)
+        print(f"  baseline written to {baseline_path}")
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Check the int8 FER+ model against fp32 on a fixed image set: per-face latency and label agreement.
+Faces are cropped with the Haar detector (whole image if none found), then scored by both models
+with the same session settings.
+Usage: python scripts/check_quantized.py --images python/samples [--threads 2] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, os.path.join(APP_ROOT, "python"))
+sys.path.insert(0, SCRIPT_DIR)
+
+
+def face_crops(images):
+    from face_detectors import HaarDetector
+    detector = HaarDetector()
+    crops = []
+    for _, img in images:
+        boxes = detector.detect(img) or [(0, 0, img.shape[1], img.shape[0])]
+        for x, y, w, h in boxes:
+            crops.append(img[y:y + h, x:x + w])
+    return crops
+
+
+def score_all(recognizer, crops, repeat):
+    results = [recognizer.predict_emotions(c, color="bgr") for c in crops]
+    times = []
+    for _ in range(repeat):
+        for c in crops:
+            started = time.perf_counter()
+            recognizer.predict_emotions(c, color="bgr")
+            times.append((time.perf_counter() - started) * 1000.0)
+    times.sort()
+    return results, sum(times) / len(times), times[min(len(times) - 1, int(0.95 * len(times)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--images", default=os.path.join(APP_ROOT, "python", "samples"))
+    parser.add_argument("--threads", type=int, default=None, help="intra-op threads (default: env / half the cores)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    import numpy as np
+    from benchmark_detectors import load_images
+    from emotion_loader import load_emotion_recognizer
+
+    if not os.path.isdir(args.images):
+        print(f"No image folder at {args.images} - pass --images")
+        return 1
+    crops = face_crops(load_images(args.images))
+    if not crops:
+        print(f"No images found in {args.images}")
+        return 1
+
+    runs = {}
+    for precision in ("fp32", "int8"):
+        recognizer = load_emotion_recognizer(precision=precision, intra_op_threads=args.threads)
+        runs[precision] = score_all(recognizer, crops, args.repeat)
+
+    print(f"{len(crops)} faces, {args.repeat} runs each")
+    for precision, (_, mean_ms, p95_ms) in runs.items():
+        print(f"  {precision:5s} mean {mean_ms:6.2f} ms  p95 {p95_ms:6.2f} ms")
+    ref, quant = runs["fp32"][0], runs["int8"][0]
+    agree = sum(1 for (a, _), (b, _) in zip(ref, quant) if a == b) / len(crops)
+    drift = float(np.mean([np.abs(sa - sb).max() for (_, sa), (_, sb) in zip(ref, quant)]))
+    print(f"  label agreement int8 vs fp32: {agree:.0%}  mean max score drift: {drift:.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
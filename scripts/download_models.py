@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-Pre-download FER+ ONNX model for offline use on Arduino UNO Q.
+Pre-download FER+ ONNX model (and optional face detector models) for offline use on Arduino UNO Q.
 Run this on a machine with internet before deploying to the device.
 """
 import os
@@ -11,26 +11,40 @@ import urllib.request
 MODEL_NAME = "emotion-ferplus-8"
 MODEL_URL = "https://github.com/onnx/models/raw/main/validated/vision/body_analysis/emotion_ferplus/model/emotion-ferplus-8.onnx"
 
+# Optional int8 FER+ (~19 MB, TEDDY_FER_PRECISION=int8) - pass --int8 to download it too
+INT8_MODEL_NAME = "emotion-ferplus-12-int8"
+INT8_MODEL_URL = "https://github.com/onnx/models/raw/main/validated/vision/body_analysis/emotion_ferplus/model/emotion-ferplus-12-int8.onnx"
+
+# Optional face detector backends (TEDDY_FACE_DETECTOR=yunet|onnx) - small, bundled for offline use
+DETECTOR_MODELS = {
+    "face_detection_yunet_2023mar": "https://github.com/opencv/opencv_zoo/raw/main/models/face_detection_yunet/face_detection_yunet_2023mar.onnx",
+    "version-RFB-320": "https://github.com/onnx/models/raw/main/validated/vision/body_analysis/ultraface/models/version-RFB-320.onnx",
+}
+
 
 def main():
     script_dir = os.path.dirname(os.path.abspath(__file__))
     app_root = os.path.dirname(script_dir)
     models_dir = os.path.join(app_root, "python", "models")
     os.makedirs(models_dir, exist_ok=True)
-    model_path = os.path.join(models_dir, f"{MODEL_NAME}.onnx")
-
-    if os.path.isfile(model_path):
-        print(f"Model already exists: {model_path}")
-        return 0
-
-    print(f"Downloading {MODEL_NAME} from {MODEL_URL}...")
-    try:
-        urllib.request.urlretrieve(MODEL_URL, model_path)
-        print(f"Saved to {model_path}")
-        return 0
-    except Exception as e:
-        print(f"Error: {e}", file=sys.stderr)
-        return 1
+    models = [(MODEL_NAME, MODEL_URL)] + list(DETECTOR_MODELS.items())
+    if "--int8" in sys.argv[1:]:
+        models.append((INT8_MODEL_NAME, INT8_MODEL_URL))
+    for name, url in models:
+        model_path = os.path.join(models_dir, f"{name}.onnx")
+        if os.path.isfile(model_path):
+            print(f"Model already exists: {model_path}")
+            continue
+        print(f"Downloading {name} from {url}...")
+        try:
+            urllib.request.urlretrieve(url, model_path)
+            print(f"Saved to {model_path}")
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            if name == MODEL_NAME:
+                return 1
+            # Detector / int8 models are optional
+    return 0
 
 
 if __name__ == "__main__":
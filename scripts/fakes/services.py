@@ -0,0 +1,311 @@
+"""
+Local stand-ins for the services main.py talks to, for measuring the capture pipeline offline.
+  FakeGemini      client.models.generate_content / generate_content_stream
+  FakeElevenLabs  client.text_to_speech.stream / convert
+  FakeBridge      call / provide / notify, plus press() for the pin-2 button
+  FakeWebUI       on_message / send_message, plus emit() for browser messages and listeners
+  FakeCapture, FakeFaceDetector, FakeRecognizer  camera and vision without a webcam or models
+The service fakes take a delay, a streaming chunk size and an error rate. install() registers them
+under the module names main.py imports (arduino.*, google.genai, elevenlabs.client), so the app's
+own loaders pick them up unchanged. Usage: see scripts/load_capture.py.
+"""
+import importlib.util
+import itertools
+import random
+import sys
+import threading
+import time
+import types
+
+
+class FakeAPIError(Exception):
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+# Error presets for --*-error flags; the messages mimic the real SDKs closely enough for main.py's checks
+ERRORS = {
+    "402": ("status_code: 402, body: {'detail': {'status': 'quota_exceeded', 'message': 'You have 0 credits remaining'}}", 402),
+    "429": ("429 RESOURCE_EXHAUSTED. Resource has been exhausted (e.g. check quota).", 429),
+    "500": ("500 INTERNAL. An internal error has occurred.", 500),
+    "timeout": ("The read operation timed out", None),
+}
+
+
+class _Faults:
+    """Shared delay / error-injection knobs. rng is seeded so runs are repeatable."""
+
+    def __init__(self, delay=0.0, jitter=0.0, error_rate=0.0, error="500", seed=None):
+        self.delay = delay
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error = error
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+
+    def wait(self, seconds=None):
+        seconds = self.delay if seconds is None else seconds
+        if self.jitter:
+            with self._lock:
+                seconds += self._rng.uniform(0, self.jitter)
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def maybe_fail(self):
+        with self._lock:
+            self.calls += 1
+            failed = self.error_rate and self._rng.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        if failed:
+            message, status = ERRORS.get(self.error, (self.error, None))
+            raise FakeAPIError(message, status)
+
+
+# --- Gemini ---
+_LINES = [
+    "Your {e} eyes hold a quiet light,", "like lanterns left on through the night.",
+    "I read the weather of your face,", "and find in it my favourite place.",
+    "", "Whatever {e} days may bring,", "I'll hold your hand through everything.",
+    "The world can wait outside the door;", "it's you and me, and nothing more.",
+]
+
+
+class _Chunk:
+    def __init__(self, text):
+        self.text = text
+
+
+class _GeminiModels:
+    def __init__(self, owner):
+        self._owner = owner
+
+    def _poem(self, contents):
+        emotion = "tender"
+        for word in ("happy", "sad", "angry", "surprise", "fear", "disgust", "contempt", "neutral"):
+            if f"appear {word}" in str(contents):
+                emotion = word
+        # Numbered so every poem is new (no TTS cache hits across captures)
+        n = next(self._owner._ids)
+        return "\n".join(line.format(e=emotion) for line in _LINES) + f"\n(poem {n})"
+
+    def generate_content(self, model=None, contents=None, **kwargs):
+        faults = self._owner.faults
+        faults.maybe_fail()
+        text = self._poem(contents)
+        faults.wait(faults.delay + self._owner.chunk_delay * (len(text) // self._owner.chunk_chars))
+        return _Chunk(text)
+
+    def generate_content_stream(self, model=None, contents=None, **kwargs):
+        faults = self._owner.faults
+        faults.maybe_fail()
+        text = self._poem(contents)
+        size = self._owner.chunk_chars
+        faults.wait()  # time to first token
+        for i in range(0, len(text), size):
+            if i:
+                faults.wait(self._owner.chunk_delay)
+            yield _Chunk(text[i:i + size])
+
+
+class FakeGemini:
+    """google.genai.Client stand-in: first chunk after `delay`, then `chunk_chars` every `chunk_delay`."""
+
+    def __init__(self, api_key=None, delay=0.6, chunk_chars=40, chunk_delay=0.08, **faults):
+        self.faults = _Faults(delay=delay, **faults)
+        self.chunk_chars = max(1, chunk_chars)
+        self.chunk_delay = chunk_delay
+        self._ids = itertools.count(1)
+        self.models = _GeminiModels(self)
+
+
+# --- ElevenLabs ---
+class _TextToSpeech:
+    def __init__(self, owner):
+        self._owner = owner
+
+    def stream(self, text="", voice_id=None, model_id=None, output_format=None, **kwargs):
+        owner = self._owner
+        total = max(owner.chunk_bytes, int(len(text) * owner.bytes_per_char))
+        # Like the SDK, nothing happens until the response is iterated
+        owner.faults.maybe_fail()
+        owner.faults.wait()  # time to first byte
+        sent = 0
+        while sent < total:
+            if sent:
+                owner.faults.wait(owner.chunk_delay)
+            n = min(owner.chunk_bytes, total - sent)
+            yield b"\xff\xfb" + bytes(n - 2) if n > 2 else bytes(n)
+            sent += n
+
+    def convert(self, **kwargs):
+        return b"".join(self.stream(**kwargs))
+
+
+class FakeElevenLabs:
+    """elevenlabs.client.ElevenLabs stand-in: MP3-sized bytes (bytes_per_char of text), first chunk
+    after `delay`, then `chunk_bytes` every `chunk_delay`."""
+
+    def __init__(self, api_key=None, delay=0.35, chunk_bytes=4096, chunk_delay=0.05, bytes_per_char=200, **faults):
+        self.faults = _Faults(delay=delay, **faults)
+        self.chunk_bytes = max(1, chunk_bytes)
+        self.chunk_delay = chunk_delay
+        self.bytes_per_char = bytes_per_char
+        self.text_to_speech = _TextToSpeech(self)
+
+
+# --- Arduino App Lab ---
+class FakeBridge:
+    """Router Bridge stand-in. call() answers from `responses` (default None) after `delay`."""
+
+    def __init__(self, delay=0.002, responses=None, **faults):
+        self.faults = _Faults(delay=delay, **faults)
+        self.responses = dict(responses or {})
+        self._provided = {}
+        self._lock = threading.Lock()
+        self.counts = {}
+
+    def call(self, method, *args, timeout=None):
+        with self._lock:
+            self.counts[method] = self.counts.get(method, 0) + 1
+        self.faults.maybe_fail()
+        self.faults.wait()
+        return self.responses.get(method)
+
+    def notify(self, method, *args):
+        handler = self._provided.get(method)
+        if handler:
+            handler(*args)
+
+    def provide(self, method, handler):
+        self._provided[method] = handler
+
+    def press(self):
+        """What the sketch does on a pin-2 interrupt: notify buttonPressed."""
+        self.notify("buttonPressed")
+
+
+class FakeWebUI:
+    """WebUI stand-in. send_message() goes to listeners(name, data, t); emit() plays a browser message."""
+
+    def __init__(self, *args, **kwargs):
+        self._handlers = {}
+        self.listeners = []
+        self.sent = {}
+
+    def on_message(self, message, handler):
+        self._handlers[message] = handler
+
+    def send_message(self, message, data=None, room=None):
+        now = time.time()
+        self.sent[message] = self.sent.get(message, 0) + 1
+        for listener in list(self.listeners):
+            listener(message, data or {}, now)
+
+    def emit(self, message, data=None, client_id="fake-browser"):
+        handler = self._handlers.get(message)
+        if handler:
+            handler(client_id, data)
+
+
+class FakeApp:
+    def __init__(self):
+        self._stop = threading.Event()
+
+    def run(self):
+        self._stop.wait()
+
+    def stop(self):
+        self._stop.set()
+
+
+# --- Camera and vision (for runs without a webcam or models) ---
+class FakeCapture:
+    """cv2.VideoCapture stand-in that replays one frame at `fps`."""
+
+    def __init__(self, frame, fps=30.0):
+        self.frame = frame
+        self.interval = 1.0 / fps if fps else 0.0
+
+    def isOpened(self):
+        return True
+
+    def read(self):
+        if self.interval:
+            time.sleep(self.interval)
+        return True, self.frame
+
+    def set(self, prop, value):
+        return True
+
+    def release(self):
+        pass
+
+
+class FakeFaceDetector:
+    """One centered face per frame after `delay`."""
+    name = "fake"
+
+    def __init__(self, delay=0.015):
+        self.delay = delay
+
+    def detect(self, image, min_size=48):
+        time.sleep(self.delay)
+        h, w = image.shape[:2]
+        side = max(min_size, min(w, h) // 2)
+        return [((w - side) // 2, (h - side) // 2, side, side)]
+
+
+class FakeRecognizer:
+    """FER+ stand-in: cycles through the labels (one-hot scores), `delay` per face."""
+    LABELS = ["neutral", "happiness", "surprise", "sadness", "anger", "disgust", "fear", "contempt"]
+
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self._next = itertools.count()
+
+    def predict_emotions_batch(self, faces, logits=False, color="rgb"):
+        import numpy as np
+        results = []
+        for _ in faces:
+            time.sleep(self.delay)
+            i = next(self._next) % len(self.LABELS)
+            scores = np.zeros(len(self.LABELS), dtype=np.float32)
+            scores[i] = 1.0
+            results.append((self.LABELS[i], scores))
+        return results
+
+    def predict_emotions(self, face, logits=False, color="rgb"):
+        return self.predict_emotions_batch([face], logits=logits, color=color)[0]
+
+
+def _module(name, **attrs):
+    module = types.ModuleType(name)
+    module.__spec__ = importlib.util.spec_from_loader(name, loader=None)  # so find_spec() sees it
+    module.__dict__.update(attrs)
+    sys.modules[name] = module
+    return module
+
+
+def install(gemini=None, elevenlabs=None, bridge=None, app=None):
+    """Register the fakes under the names main.py imports. Call before `import main`.
+    gemini / elevenlabs: configured FakeGemini / FakeElevenLabs returned from Client(...)."""
+    bridge = bridge or FakeBridge()
+    app = app or FakeApp()
+    gemini = gemini or FakeGemini()
+    elevenlabs = elevenlabs or FakeElevenLabs()
+    arduino = _module("arduino")
+    arduino.app_utils = _module("arduino.app_utils", App=app, Bridge=bridge)
+    arduino.app_bricks = _module("arduino.app_bricks")
+    arduino.app_bricks.web_ui = _module("arduino.app_bricks.web_ui", WebUI=FakeWebUI)
+    try:
+        import google
+    except ImportError:
+        google = _module("google")
+    google.genai = _module("google.genai", Client=lambda api_key=None, **kwargs: gemini)
+    package = _module("elevenlabs")
+    package.client = _module("elevenlabs.client", ElevenLabs=lambda api_key=None, **kwargs: elevenlabs)
+    return types.SimpleNamespace(gemini=gemini, elevenlabs=elevenlabs, bridge=bridge, app=app)
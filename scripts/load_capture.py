@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+End-to-end capture latency under load, offline: main.py runs unchanged against local stand-ins for
+Gemini, ElevenLabs, the Bridge and the web UI (scripts/fakes/services.py).
+Fires button (Bridge buttonPressed) and browser (capture message) captures from concurrent threads
+and reports capture-to-poem, capture-to-first-audio and capture-to-done percentiles plus throughput.
+Camera and vision are faked too unless --real-vision (needs the models and a face in --image).
+Usage: python scripts/load_capture.py [--captures 40] [--concurrency 4] [--button-share 0.5]
+         [--gemini-delay 0.6] [--tts-delay 0.35] [--tts-error-rate 0.1 --tts-error 402] [--json out.json]
+"""
+import argparse
+import base64
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, os.path.join(APP_ROOT, "python"))
+sys.path.insert(0, os.path.join(SCRIPT_DIR, "fakes"))
+
+STAGES = ["acquire", "detect", "poem", "speak"]  # main.py's capture pipeline, in order
+
+
+def percentiles(values):
+    ordered = sorted(values)
+    if not ordered:
+        return {"count": 0}
+
+    def q(p):
+        return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 1)
+
+    return {"count": len(ordered), "p50": q(0.5), "p95": q(0.95), "p99": q(0.99), "max": round(ordered[-1], 1)}
+
+
+class Recorder:
+    """Follows the UI messages main.py sends and times each job from the moment its capture fired."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._done = threading.Condition(self._lock)
+        self._local = threading.local()
+        self.jobs = {}         # job_id -> {"source", "fired", "poem", "first_audio", "done", "error"}
+        self.rejected = 0
+        self.tts_errors = {}
+        self._speaking = None  # one speak worker, so audio belongs to the job it is running
+
+    def fire(self, capture):
+        """Run one capture call on this thread; the job it submits (if any) is stamped with now.
+        Returns False if the pipeline refused it."""
+        self._local.fired = time.time()
+        self._local.job = None
+        capture()
+        if self._local.job is None:
+            with self._lock:
+                self.rejected += 1
+            return False
+        return True
+
+    def submitted(self, job):
+        if job is not None:
+            self._local.job = job
+            with self._lock:
+                self.jobs.setdefault(job.id, {}).update(source=job.source, fired=self._local.fired)
+
+    def on_message(self, name, data, now):
+        job_id = data.get("job_id")
+        with self._lock:
+            if name == "capture_status":
+                job = self.jobs.setdefault(job_id, {})
+                stage = STAGES.index(data["stage"]) if data.get("stage") in STAGES else 0
+                if stage < job.get("stage", 0) or "done" in job:
+                    return  # an earlier stage finishing after it handed off
+                job["stage"] = stage
+                if data.get("stage") == "speak" and data.get("state") == "running":
+                    self._speaking = job_id
+                if data.get("state") in ("failed", "cancelled") or (data.get("stage") == "speak" and data.get("state") == "done"):
+                    job["done"] = now
+                    if data.get("state") != "done":
+                        job["error"] = data.get("error") or data.get("state")
+                    self._done.notify_all()
+            elif name == "poem" and job_id in self.jobs:
+                self.jobs[job_id].setdefault("poem", now)
+                if data.get("api_error"):
+                    self.jobs[job_id]["api_error"] = data["api_error"]
+            elif name == "audio_stream" and self._speaking in self.jobs:
+                self.jobs[self._speaking].setdefault("first_audio", now)
+            elif name == "tts_error":
+                error = data.get("error", "")[:60]
+                self.tts_errors[error] = self.tts_errors.get(error, 0) + 1
+                if job_id in self.jobs:
+                    self.jobs[job_id]["error"] = error
+
+    def wait(self, timeout):
+        deadline = time.time() + timeout
+        with self._done:
+            while any("done" not in job for job in self.jobs.values()):
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self._done.wait(remaining)
+            return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--captures", type=int, default=40, help="captures to fire in total")
+    parser.add_argument("--concurrency", type=int, default=4, help="threads firing captures at once")
+    parser.add_argument("--interval", type=float, default=0.0, help="pause between captures per thread (s)")
+    parser.add_argument("--retry-after", type=float, default=0.25,
+                        help="retry a refused capture after this long (s); 0 drops it")
+    parser.add_argument("--button-share", type=float, default=0.5, help="fraction fired as pin-2 button presses")
+    parser.add_argument("--image", help="frame for browser uploads and the fake camera (default: gray test frame)")
+    parser.add_argument("--real-vision", action="store_true", help="load the real face detector and FER+ model")
+    parser.add_argument("--vision-delay", type=float, default=0.015, help="fake detector / recognizer delay (s)")
+    parser.add_argument("--gemini-delay", type=float, default=0.6, help="time to first token (s)")
+    parser.add_argument("--gemini-chunk-chars", type=int, default=40)
+    parser.add_argument("--gemini-chunk-delay", type=float, default=0.08)
+    parser.add_argument("--gemini-error-rate", type=float, default=0.0)
+    parser.add_argument("--gemini-error", default="429", help="402 | 429 | 500 | timeout | any message")
+    parser.add_argument("--tts-delay", type=float, default=0.35, help="time to first byte (s)")
+    parser.add_argument("--tts-chunk-bytes", type=int, default=4096)
+    parser.add_argument("--tts-chunk-delay", type=float, default=0.05)
+    parser.add_argument("--tts-error-rate", type=float, default=0.0)
+    parser.add_argument("--tts-error", default="402", help="402 | 429 | 500 | timeout | any message")
+    parser.add_argument("--bridge-delay", type=float, default=0.002)
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random delay (s) on every fake call")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=300.0, help="give up waiting for jobs after this long (s)")
+    parser.add_argument("--json", dest="json_path", help="also write the report to this file")
+    args = parser.parse_args()
+
+    import numpy as np
+    from services import FakeCapture, FakeElevenLabs, FakeFaceDetector, FakeGemini, FakeRecognizer, install
+
+    # Keys are only checked for presence; a fresh TTS cache keeps every poem a cache miss
+    os.environ["GEMINI_API_KEY"] = "fake"
+    os.environ["ELEVENLABS_API_KEY"] = "fake"
+    os.environ["TEDDY_TTS_CACHE_DIR"] = tempfile.mkdtemp(prefix="teddy-load-tts-")
+    os.environ["TEDDY_POEM_POOL_SIZE"] = "0"
+    os.environ["TEDDY_EMOTION_TRACKING"] = "0"
+    os.environ["TEDDY_AUDIO_OUTPUT"] = "browser"
+    os.environ["TEDDY_BLUETOOTHCTL"] = os.path.join(SCRIPT_DIR, "fakes", "bluetoothctl")
+    faults = {"jitter": args.jitter, "seed": args.seed}
+    fakes = install(
+        gemini=FakeGemini(delay=args.gemini_delay, chunk_chars=args.gemini_chunk_chars, chunk_delay=args.gemini_chunk_delay,
+                          error_rate=args.gemini_error_rate, error=args.gemini_error, **faults),
+        elevenlabs=FakeElevenLabs(delay=args.tts_delay, chunk_bytes=args.tts_chunk_bytes, chunk_delay=args.tts_chunk_delay,
+                                  error_rate=args.tts_error_rate, error=args.tts_error, **faults),
+    )
+    fakes.bridge.faults.delay = args.bridge_delay
+    fakes.bridge.responses["enableButtonEvents"] = True
+
+    import main as app
+    import cv2
+
+    frame = cv2.imread(args.image, cv2.IMREAD_COLOR) if args.image else None
+    if frame is None:
+        frame = np.full((480, 640, 3), 128, dtype=np.uint8)
+    upload = base64.b64encode(cv2.imencode(".jpg", frame)[1].tobytes()).decode()
+
+    app.CAPTURE_COOLDOWN = 0  # measure the pipeline, not the rate limit
+    app.get_camera = lambda: FakeCapture(frame)
+    recorder = Recorder()
+    app.ui.listeners.append(recorder.on_message)
+    submit = app.capture_pipeline.submit
+
+    def _submit(*a, **kw):
+        job = submit(*a, **kw)
+        recorder.submitted(job)
+        return job
+
+    app.capture_pipeline.submit = _submit
+
+    startup = app.startup
+    startup.load("opencv", app._load_opencv)
+    if args.real_vision:
+        startup.load("face_detector", app._load_face_detector, warmup=app._warm_up_detector, after=("opencv",))
+        startup.load("emotion_recognizer", app._load_emotion_recognizer, warmup=app._warm_up_recognizer, after=("opencv",))
+    else:
+        startup.step("face_detector", lambda: setattr(app, "face_detector", FakeFaceDetector(args.vision_delay)))
+        startup.step("emotion_recognizer", lambda: setattr(app, "emotion_recognizer", FakeRecognizer(args.vision_delay)))
+    startup.load("emotion", app._enable_emotion, after=app.EMOTION_COMPONENTS)
+    startup.load("gemini", app._load_gemini)
+    startup.load("elevenlabs", app._load_elevenlabs)
+    if not startup.wait():
+        print(startup.report())
+        return 1
+    app.get_frame_hub().wait_next(0, 5.0)  # first fake camera frame, so button captures don't race the hub
+
+    counter = iter(range(args.captures))
+    counter_lock = threading.Lock()
+
+    def worker(n):
+        while True:
+            with counter_lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            # Deterministic mix: spread button presses evenly through the run
+            button = int((i + 1) * args.button_share) > int(i * args.button_share)
+            if button:
+                capture = fakes.bridge.press
+            else:
+                capture = lambda: app.ui.emit("capture", {"image": upload}, client_id=f"browser-{n}")
+            # A refused capture is pressed again, like a user would, until the pipeline takes it
+            while not recorder.fire(capture) and args.retry_after > 0:
+                time.sleep(args.retry_after)
+            if args.interval:
+                time.sleep(args.interval)
+
+    print(f"{args.captures} captures, {args.concurrency} threads, {args.button_share:.0%} button, "
+          f"vision {'real' if args.real_vision else 'fake'}")
+    started = time.time()
+    threads = [threading.Thread(target=worker, args=(n,), daemon=True) for n in range(max(1, args.concurrency))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    finished = recorder.wait(args.timeout)
+    wall = time.time() - started
+
+    jobs = list(recorder.jobs.values())
+    ok = [j for j in jobs if "done" in j and "error" not in j]
+    report = {
+        "captures": args.captures,
+        "accepted": len(jobs),
+        "rejected": recorder.rejected,
+        "completed": len(ok),
+        "failed": sum(1 for j in jobs if j.get("error")),
+        "unfinished": sum(1 for j in jobs if "done" not in j),
+        "wall_s": round(wall, 2),
+        "throughput_per_min": round(len(ok) / wall * 60.0, 1) if wall else 0.0,
+        "latency_ms": {},
+        "tts_errors": recorder.tts_errors,
+        "api_errors": sum(1 for j in jobs if j.get("api_error")),
+        "gemini_calls": fakes.gemini.faults.calls,
+        "tts_calls": fakes.elevenlabs.faults.calls,
+        "bridge_calls": dict(fakes.bridge.counts),
+        "stages": app.metrics.snapshot()["timers"],
+    }
+    for source in ("all", "button", "browser"):
+        picked = [j for j in jobs if source == "all" or j.get("source") == source]
+        report["latency_ms"][source] = {
+            name: percentiles([(j[key] - j["fired"]) * 1000.0 for j in picked if key in j and "fired" in j])
+            for name, key in (("poem", "poem"), ("first_audio", "first_audio"), ("done", "done"))
+        }
+
+    print(f"  accepted {report['accepted']}, refused {report['rejected']} times (pipeline full), "
+          f"completed {report['completed']}, failed {report['failed']}, unfinished {report['unfinished']}")
+    print(f"  {report['throughput_per_min']:.1f} captures/min over {wall:.1f} s")
+    print(f"  {'source':8s} {'latency':12s} {'count':>6s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s} {'max ms':>9s}")
+    for source, rows in report["latency_ms"].items():
+        for name, s in rows.items():
+            if s["count"]:
+                print(f"  {source:8s} {name:12s} {s['count']:6d} {s['p50']:9.1f} {s['p95']:9.1f} {s['p99']:9.1f} {s['max']:9.1f}")
+    for error, n in recorder.tts_errors.items():
+        print(f"  tts_error x{n}: {error}")
+    if report["api_errors"]:
+        print(f"  {report['api_errors']} poems fell back after a Gemini error")
+    if not finished:
+        print(f"  gave up after {args.timeout:.0f} s with jobs still running")
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0 if finished else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
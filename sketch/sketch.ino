@@ -19,6 +19,7 @@
 String current_emotion = "NEUTRAL";
 float current_confidence = 80.0f;
 unsigned long last_pupil_move = 0;
+unsigned long gaze_hold_until = 0;  // Python is steering the pupils; pause the idle wander
 int pupil_offset_x = 0;
 int pupil_offset_y = 0;
 
@@ -30,19 +31,27 @@ int pupil_offset_y = 0;
 Adafruit_SSD1306 display(SCREEN_WIDTH, SCREEN_HEIGHT, &Wire, OLED_RESET);
 void draw_eyes(String emotion, float confidence, bool blink);
 void draw_blink();
+void move_pupils(int px, int py);
 #endif
 
 #define BUTTON_PIN 2
-volatile bool button_pressed = false;
-bool last_button_state = HIGH;
+#define BUTTON_DEBOUNCE_MS 50
+volatile bool button_event = false;        // set by the ISR, consumed in loop()
+volatile unsigned long last_press_ms = 0;
+bool button_pressed = false;               // latched press for getButtonPressed (polling fallback)
+bool button_events = false;                // Python asked for pushed events (enableButtonEvents)
 
 void set_emotion(String emotion, float confidence);
+void set_eye_state(String emotion, int confidence, int gaze_x, int gaze_y, bool blink);
 bool get_button_pressed();
+bool enable_button_events();
+void on_button_isr();
 
 void setup() {
   Serial.begin(115200);
 
   pinMode(BUTTON_PIN, INPUT_PULLUP);
+  attachInterrupt(digitalPinToInterrupt(BUTTON_PIN), on_button_isr, FALLING);
 
 #ifdef HAS_OLED
   Wire.begin();
@@ -58,7 +67,9 @@ void setup() {
 
   Bridge.begin();
   Bridge.provide("setEmotion", set_emotion);
+  Bridge.provide("setEyeState", set_eye_state);
   Bridge.provide("getButtonPressed", get_button_pressed);
+  Bridge.provide("enableButtonEvents", enable_button_events);
 
   pinMode(LED_BUILTIN, OUTPUT);
   digitalWrite(LED_BUILTIN, HIGH);
@@ -66,21 +77,40 @@ void setup() {
   Serial.println("Teddy Talk - Ready");
 }
 
+// Falling edge on pin 2; contact bounce within BUTTON_DEBOUNCE_MS of the last press is ignored
+void on_button_isr() {
+  unsigned long t = millis();
+  if (t - last_press_ms >= BUTTON_DEBOUNCE_MS) {
+    last_press_ms = t;
+    button_event = true;
+  }
+}
+
 bool get_button_pressed() {
   bool p = button_pressed;
   button_pressed = false;
   return p;
 }
 
+// Called once by the Python side: from now on presses are pushed with Bridge.notify
+bool enable_button_events() {
+  button_events = true;
+  button_pressed = false;
+  return true;
+}
+
 void loop() {
-  bool now = digitalRead(BUTTON_PIN);
-  if (last_button_state == HIGH && now == LOW) {
-    button_pressed = true;
+  if (button_event) {
+    button_event = false;
+    if (button_events) {
+      Bridge.notify("buttonPressed");
+    } else {
+      button_pressed = true;
+    }
   }
-  last_button_state = now;
 #ifdef HAS_OLED
   unsigned long now = millis();
-  if (now - last_pupil_move > 2000) {
+  if (now - last_pupil_move > 2000 && (long)(now - gaze_hold_until) >= 0) {
     last_pupil_move = now;
     pupil_offset_x = (pupil_offset_x + 2) % 5 - 2;
     pupil_offset_y = (pupil_offset_y + 1) % 3 - 1;
@@ -116,7 +146,48 @@ void set_emotion(String emotion, float confidence) {
 #endif
 }
 
+// Compact eye state from the Python eye channel (coalesced, rate-limited there).
+// Only what changed is redrawn: same emotion and gaze -> nothing, gaze only -> pupils only.
+void set_eye_state(String emotion, int confidence, int gaze_x, int gaze_y, bool blink) {
+  gaze_x = constrain(gaze_x, -2, 2);
+  gaze_y = constrain(gaze_y, -1, 1);
+  bool emotion_changed = emotion != current_emotion;
+  bool gaze_changed = gaze_x != pupil_offset_x || gaze_y != pupil_offset_y;
+  current_confidence = confidence;
+  gaze_hold_until = millis() + 5000;
+
+  if (emotion_changed) {
+    set_emotion(emotion, confidence);  // blink transition + full redraw
+  }
+#ifdef HAS_OLED
+  if (blink && !emotion_changed) {
+    draw_blink();
+    draw_eyes(current_emotion, current_confidence, false);
+  }
+  if (gaze_changed) {
+    move_pupils(gaze_x, gaze_y);
+  }
+#endif
+  pupil_offset_x = gaze_x;
+  pupil_offset_y = gaze_y;
+}
+
 #ifdef HAS_OLED
+// Erase the old pupils and redraw each eye in place (no clearDisplay, so no flicker)
+void move_pupils(int px, int py) {
+  int eye_w = 24;
+  int eye_h = 20;
+  int cy = 16;
+  int pupil_r = 5;  // covers the SURPRISE pupil too
+  display.fillCircle(32 + pupil_offset_x, cy - 2 + pupil_offset_y, pupil_r, SSD1306_BLACK);
+  display.fillCircle(32 + pupil_offset_x, cy + pupil_offset_y, pupil_r, SSD1306_BLACK);
+  display.fillCircle(96 - pupil_offset_x, cy - 2 + pupil_offset_y, pupil_r, SSD1306_BLACK);
+  display.fillCircle(96 - pupil_offset_x, cy + pupil_offset_y, pupil_r, SSD1306_BLACK);
+  draw_eye_expression(32, cy, eye_w, eye_h, 4, px, py, current_emotion);
+  draw_eye_expression(96, cy, eye_w, eye_h, 4, -px, py, current_emotion);
+  display.display();
+}
+
 void draw_blink() {
   display.clearDisplay();
   display.drawLine(20, 16, 44, 16, SSD1306_WHITE);